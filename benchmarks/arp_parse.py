@@ -0,0 +1,95 @@
+"""
+/proc/net/arp parsing on large synthetic tables (office-VLAN sized): the old
+line-by-line parser vs parse_arp(), plus decoding the same table as netlink
+neighbour messages.
+
+    python -m benchmarks.arp_parse [entries]
+"""
+
+import random
+import socket
+import sys
+import time
+
+from screens.lan_devices import (
+    _NDMSG,
+    _NLMSGHDR,
+    _RTATTR,
+    NDA_DST,
+    NDA_LLADDR,
+    RTM_NEWNEIGH,
+    parse_arp,
+    parse_neighbour_messages,
+)
+
+HEADER = "IP address       HW type     Flags       HW address            Mask     Device\n"
+
+
+def _entries(count: int) -> list[tuple[str, str, str]]:
+    # (ip, flags, mac); about one in ten incomplete, as after a sweep.
+    rng = random.Random(0)
+    entries = []
+    for i in range(count):
+        ip = f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+        if rng.random() < 0.1:
+            entries.append((ip, "0x0", "00:00:00:00:00:00"))
+        else:
+            entries.append((ip, "0x2", ":".join(f"{rng.randrange(256):02x}" for _ in range(6))))
+    return entries
+
+
+def _proc_text(entries) -> str:
+    return HEADER + "".join(
+        f"{ip:<16} 0x1         {flags:<11} {mac}     *        eth0\n" for ip, flags, mac in entries
+    )
+
+
+def _netlink_datagram(entries) -> bytes:
+    data = b""
+    for ip, flags, mac in entries:
+        attrs = b""
+        for attr_type, value in ((NDA_DST, socket.inet_aton(ip)), (NDA_LLADDR, bytes.fromhex(mac.replace(":", "")))):
+            attr = _RTATTR.pack(_RTATTR.size + len(value), attr_type) + value
+            attrs += attr + b"\0" * (-len(attr) % 4)
+        body = _NDMSG.pack(socket.AF_INET, 0, 0, 2, 0x02 if flags == "0x2" else 0x01, 0, 1) + attrs
+        data += _NLMSGHDR.pack(_NLMSGHDR.size + len(body), RTM_NEWNEIGH, 0, 0, 0) + body
+    return data
+
+
+def _parse_by_line(text: str) -> dict[str, str]:
+    # The parser LanScreen used before parse_arp().
+    table = {}
+    for line in text.splitlines()[1:]:
+        p = line.split()
+        if len(p) >= 4 and p[2] != "0x0" and p[3] != "00:00:00:00:00:00":
+            table[p[0]] = p[3]
+    return table
+
+
+def _time(fn, arg, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn(arg)
+    return (time.perf_counter() - start) / rounds * 1000, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    entries = _entries(count)
+    text = _proc_text(entries)
+    datagram = _netlink_datagram(entries)
+
+    by_line_ms, expected = _time(_parse_by_line, text, 50)
+    strided_ms, table = _time(parse_arp, text, 50)
+    assert table == expected
+    netlink_ms, messages = _time(parse_neighbour_messages, datagram, 50)
+    assert len(messages) == count
+
+    print(f"{count} entries ({len(expected)} resolved):")
+    print(f"  line-by-line parse   {by_line_ms:7.2f} ms")
+    print(f"  parse_arp()          {strided_ms:7.2f} ms")
+    print(f"  netlink decode       {netlink_ms:7.2f} ms  (full dump; afterwards only changes are decoded)")
+
+
+if __name__ == "__main__":
+    main()
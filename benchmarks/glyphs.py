@@ -0,0 +1,49 @@
+"""
+Micro-benchmark: ImageDraw.text() vs the shared glyph atlas on a 128x64 mode "1" frame.
+
+    python -m benchmarks.glyphs
+"""
+
+import timeit
+
+from PIL import Image, ImageDraw
+
+from screens.base import draw_text, glyph_atlas, load_font, text_bbox
+
+SAMPLES = [
+    ("FreePixel.ttf", 20, "14:30:05"),
+    ("FreePixel.ttf", 20, "Wednesday"),
+    ("FreePixel.ttf", 28, "-12°C"),
+    ("FreePixel.ttf", 14, "Hvy Sno Shwrs"),
+    ("FreePixel.ttf", 16, "123.4/1000 km"),
+]
+ROUNDS = 2000
+
+
+def _bench(fn) -> float:
+    return timeit.timeit(fn, number=ROUNDS) / ROUNDS * 1e6
+
+
+def main():
+    image = Image.new("1", (128, 64))
+    draw = ImageDraw.Draw(image)
+
+    print(f"{'font':<18} {'text':<16} {'textbbox':>10} {'cached':>8} {'text()':>9} {'atlas':>8}  exact")
+    for name, size, text in SAMPLES:
+        font = load_font(name, size)
+        atlas = glyph_atlas(font)
+        draw_text(draw, (0, 0), text, font)  # warm the atlas
+
+        bbox_us = _bench(lambda: draw.textbbox((0, 0), text, font=font))
+        cached_us = _bench(lambda: text_bbox(text, font))
+        freetype_us = _bench(lambda: draw.text((4, 20), text, fill="white", font=font))
+        atlas_us = _bench(lambda: draw_text(draw, (4, 20), text, font))
+
+        print(
+            f"{name[:-4] + ' ' + str(size):<18} {text:<16} {bbox_us:>8.1f}us {cached_us:>6.1f}us "
+            f"{freetype_us:>7.1f}us {atlas_us:>6.1f}us  {atlas.exact}"
+        )
+
+
+if __name__ == "__main__":
+    main()
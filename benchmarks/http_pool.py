@@ -0,0 +1,92 @@
+"""
+One-off httpx.get() per request vs the shared pooled client, against a local
+HTTPS stub server. Counts TLS handshakes on the server side and measures
+per-request latency on the client side. Needs the `openssl` binary to make a
+throwaway self-signed certificate.
+
+    python -m benchmarks.http_pool
+"""
+
+import http.server
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+from screens import http_client
+
+REQUESTS = 50
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _CountingServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    handshakes = 0
+
+    def get_request(self):
+        # The listening socket is TLS-wrapped, so accept() includes the handshake.
+        request = super().get_request()
+        self.handshakes += 1
+        return request
+
+
+def _self_signed(directory: Path) -> tuple[Path, Path]:
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", str(key), "-out", str(cert)],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def _run(label, server, get, url):
+    server.handshakes = 0
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        get(url).raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} {server.handshakes:>4} handshakes  {elapsed / REQUESTS * 1000:7.2f} ms/request")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = _self_signed(Path(tmp))
+        server_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_ctx.load_cert_chain(cert, key)
+        client_ctx = ssl.create_default_context(cafile=str(cert))
+
+        server = _CountingServer(("localhost", 0), _Handler)
+        server.socket = server_ctx.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"https://localhost:{server.server_address[1]}/"
+
+        print(f"{REQUESTS} sequential GETs to {url}")
+        _run("httpx.get()", server, lambda u: httpx.get(u, verify=client_ctx), url)
+        with http_client.new_client(verify=client_ctx) as client:
+            _run("shared client", server, client.get, url)
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Button-to-frame latency in the pygame emulator (headless). Runs the real
+main-loop logic with simulated button presses, while every data screen's fetch
+takes two seconds, and reports how long each press takes to put its target
+screen's frame on the display. Target: under 50 ms.
+
+    python -m benchmarks.input_latency [presses]
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from luma.emulator.device import pygame  # noqa: E402
+
+from buttons import SimulatedButtonController  # noqa: E402
+from device import FrameDiffer  # noqa: E402
+from main import InputLatency, run_loop  # noqa: E402
+from scheduler import FrameScheduler, PrefetchScheduler  # noqa: E402
+from screens.base import Screen, draw_lines, load_font  # noqa: E402
+from screens.date import DateScreen  # noqa: E402
+from screens.map import MapScreen  # noqa: E402
+
+TARGET = 0.050
+KEYS = {20: {"press": 0}, 16: {"press": 1}, 21: {"press": "next"}}
+
+
+class SlowScreen(Screen):
+    """Data screen whose fetch takes two seconds and is always stale."""
+
+    name = "slow"
+    ttl = 0.0
+
+    def __init__(self, label: str):
+        self.label = label
+        self.font = load_font("FreePixel.ttf", 20)
+        self.value = 0
+
+    def fetch(self):
+        time.sleep(2.0)
+        self.value += 1
+
+    def fingerprint(self):
+        return (self.value,)
+
+    def draw(self, draw, width, height):
+        draw_lines(draw, [(self.label, self.font), (str(self.value), self.font)], width, height, spacing=4)
+
+
+def main():
+    presses = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    screens = [SlowScreen("weather"), MapScreen(), SlowScreen("adsb"), DateScreen()]
+    for screen in screens:
+        screen.interval = 5.0
+
+    display = FrameDiffer(pygame(width=128, height=64, mode="1"))
+    buttons = SimulatedButtonController(KEYS)
+    scheduler = PrefetchScheduler(screens, on_refresh=lambda screen: buttons.wake())
+    frames = FrameScheduler(buttons.wait)
+    latency = InputLatency()
+    stop = threading.Event()
+
+    def show(screen):
+        display.display(screen.render(display.size, display.mode))
+
+    scheduler.start()
+    loop = threading.Thread(target=run_loop, args=(screens, show, buttons, scheduler, frames, latency, stop))
+    loop.start()
+    rng = random.Random(0)
+    try:
+        for _ in range(presses):
+            time.sleep(rng.uniform(0.1, 0.4))
+            buttons.click(rng.choice(list(KEYS)), hold=0.02)
+        time.sleep(0.2)
+    finally:
+        stop.set()
+        buttons.wake()
+        loop.join()
+        scheduler.stop()
+        buttons.cleanup()
+
+    print(latency.stats())
+    print(frames.stats())
+    p95 = latency.percentile(95)
+    print(f"p95 {'within' if p95 is not None and p95 < TARGET else 'over'} the {TARGET * 1000:.0f} ms target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+MapScreen: time per frame of the per-character renderer vs the pre-rendered
+blink renderer. That both draw the same pixels is checked in tests/test_map.py.
+
+    python -m benchmarks.map_blink
+"""
+
+import timeit
+
+from PIL import Image, ImageDraw
+
+from screens.map import MapScreen
+
+ROUNDS = 500
+
+
+def main():
+    chars = MapScreen(prerender=False)
+    blink = MapScreen(prerender=True)
+    chars.blink_period = blink.blink_period = 0  # one toggle per frame, same for both
+
+    image = Image.new("1", (128, 64))
+    draw = ImageDraw.Draw(image)
+    for label, screen in [("per-character", chars), ("pre-rendered", blink)]:
+        seconds = timeit.timeit(lambda: screen.draw(draw, 128, 64), number=ROUNDS)
+        print(f"{label:<14} {seconds / ROUNDS * 1e6:8.1f}us/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Local satellite counting on a synthetic Starlink-sized constellation: TLE
+parsing and one vectorised SGP4 propagation + elevation pass.
+Needs sgp4 and numpy.
+
+    python -m benchmarks.orbits [count]
+"""
+
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sgp4.api import WGS72, Satrec
+from sgp4.exporter import export_tle
+
+from screens.orbits import count_above, parse_tles
+
+EPOCH = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+LAT, LON = 58.38, 26.72
+
+
+def _constellation(count: int) -> str:
+    # Starlink-like shell: 53 deg inclination, ~550 km, spread over RAAN and anomaly.
+    rng = random.Random(0)
+    epoch_days = (EPOCH - datetime(1949, 12, 31, tzinfo=timezone.utc)).total_seconds() / 86400
+    lines = []
+    for satnum in range(1, count + 1):
+        sat = Satrec()
+        sat.sgp4init(
+            WGS72, "i", satnum, epoch_days, 2.8e-4, 0.0, 0.0, 1e-4,
+            math.radians(rng.uniform(0, 360)), math.radians(53.05),
+            math.radians(rng.uniform(0, 360)), 15.06 * 2 * math.pi / 1440,
+            math.radians(rng.uniform(0, 360)),
+        )
+        line1, line2 = export_tle(sat)
+        lines += [f"STARLINK-{satnum}", line1, line2]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 6000
+    text = _constellation(count)
+
+    start = time.perf_counter()
+    sats = parse_tles(text)
+    parse_s = time.perf_counter() - start
+
+    rounds = 20
+    start = time.perf_counter()
+    for i in range(rounds):
+        above = count_above(sats, LAT, LON, 30, EPOCH + timedelta(minutes=i))
+    count_s = (time.perf_counter() - start) / rounds
+
+    print(f"{count} satellites: parse {parse_s * 1000:.1f} ms (once per TLE download), "
+          f"propagate + count {count_s * 1000:.1f} ms per refresh ({above} above 30 deg)")
+
+
+if __name__ == "__main__":
+    main()
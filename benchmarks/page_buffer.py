@@ -0,0 +1,108 @@
+"""
+Frame pipelines into a real luma sh1106 driver whose SPI is a fake sink:
+
+  canvas   luma's canvas(device): draw, then luma packs and sends every page
+  differ   Screen.render() + FrameDiffer: Pillow frame, changed spans only
+  pages    Screen.compose() into a numpy PageBuffer + FrameDiffer.display_pages()
+
+Checks that all three send the panel the same frame, then reports frames/s
+and the CPU share at the map's frame rate. Needs numpy.
+
+    python -m benchmarks.page_buffer [frames]
+"""
+
+import random
+import sys
+import time
+
+from luma.core.render import canvas
+from luma.oled.device import sh1106
+
+from device import FrameDiffer
+from pagebuffer import PageBuffer
+from screens.map import MapScreen
+
+LOOP_FPS = MapScreen.fps
+
+
+class FakeSerial:
+    """Stands in for luma's spi(): counts bytes and keeps the panel's RAM."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.ram = [bytearray(132) for _ in range(8)]
+        self._page = self._column = 0
+
+    def command(self, *cmd):
+        self.bytes += len(cmd)
+        for byte in cmd:
+            if 0xB0 <= byte <= 0xB7:
+                self._page = byte - 0xB0
+            elif byte <= 0x0F:
+                self._column = (self._column & 0xF0) | byte
+            elif 0x10 <= byte <= 0x1F:
+                self._column = (self._column & 0x0F) | ((byte & 0x0F) << 4)
+
+    def data(self, data):
+        self.bytes += len(data)
+        self.ram[self._page][self._column : self._column + len(data)] = bytes(data)
+        self._column += len(data)
+
+    def cleanup(self):
+        pass
+
+
+def _canvas(screen, device, _display, _buffer):
+    with canvas(device) as draw:
+        screen.draw(draw, device.width, device.height)
+
+
+def _differ(screen, device, display, _buffer):
+    display.display(screen.render(display.size, display.mode))
+
+
+def _pages(screen, _device, display, buffer):
+    screen.compose(buffer)
+    display.display_pages(buffer)
+
+
+PIPELINES = {"canvas": _canvas, "differ": _differ, "pages": _pages}
+
+
+def _run(name: str, frames: int, seed: int = 0):
+    serial = FakeSerial()
+    device = sh1106(serial, rotate=2)
+    display = FrameDiffer(device, partial=True)
+    buffer = PageBuffer(device.width, device.height)
+    random.seed(seed)  # initial blink states and the toggles
+    screen = MapScreen()
+    screen.blink_period = 0  # one toggle per frame, independent of timing
+    step = PIPELINES[name]
+    serial.bytes = 0  # ignore the driver's init sequence
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(frames):
+        step(screen, device, display, buffer)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return serial, wall, cpu
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    # Same seed -> same blink sequence -> the panel must end up identical.
+    rams = {name: _run(name, 64, seed=1)[0].ram for name in PIPELINES}
+    assert rams["canvas"] == rams["differ"] == rams["pages"], "pipelines disagree"
+    print("panel RAM identical for all pipelines")
+
+    for name in PIPELINES:
+        serial, wall, cpu = _run(name, frames)
+        per_frame = cpu / frames
+        print(
+            f"{name:<7} {frames / wall:8.0f} frames/s  {per_frame * 1e6:7.1f}us CPU/frame  "
+            f"{per_frame * LOOP_FPS:.3%} CPU at {LOOP_FPS:g} fps  {serial.bytes / frames:6.1f} SPI bytes/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Cost of one SystemSampler sample and the CPU share that makes at the default
+rate. The budget is 0.5% of one core on a Pi Zero.
+
+    python -m benchmarks.sampler [samples]
+"""
+
+import sys
+import time
+
+from screens.metrics import PERIOD, SystemSampler
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sampler = SystemSampler()
+    sampler.sample()  # prime psutil's CPU counters
+
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    for _ in range(rounds):
+        sampler.sample()
+    cpu_ms = (time.thread_time() - cpu) / rounds * 1000
+    wall_ms = (time.perf_counter() - wall) / rounds * 1000
+
+    print(f"one sample: {cpu_ms:.3f} ms CPU ({wall_ms:.3f} ms wall)")
+    print(f"every {PERIOD:g} s: {cpu_ms / 1000 / PERIOD:.4%} of one core (budget 0.5%)")
+    print(f"memory: {len(sampler.cores) + 5} buffers x {sampler.cpu.capacity} samples, fixed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Request coalescing through the shared Open-Meteo source: several panels'
+worth of weather, weather_graph and rain screens for a handful of cities,
+all refreshed on a worker pool like the prefetch scheduler does, against a
+local fake Open-Meteo that answers multi-location requests.
+
+Counts upstream requests per refresh round and checks every screen got the
+forecast for its own location.
+
+    python -m benchmarks.shared_sources [cities]
+"""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from scheduler import MAX_WORKERS
+from screens import forecast, http_client
+from screens.weather import RainScreen, WeatherGraphScreen, WeatherScreen
+
+CITIES = 6
+ROUNDS = 3
+TTL = 0.5
+LATENCY = 0.1  # seconds per fake request
+
+
+class FakeOpenMeteo:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests: list[int] = []  # locations per request
+
+    def answer(self, query: dict) -> list[dict] | dict:
+        time.sleep(LATENCY)
+        lats = [float(v) for v in query["latitude"][0].split(",")]
+        lons = [float(v) for v in query["longitude"][0].split(",")]
+        with self.lock:
+            self.requests.append(len(lats))
+        now = int(time.time()) // 3600 * 3600
+        hours = [now + i * 3600 for i in range(-1, 48)]
+        answers = [
+            {
+                "latitude": lat,
+                "longitude": lon,
+                "utc_offset_seconds": 0,
+                # The latitude as the temperature, so the screens can be checked.
+                "hourly": {
+                    "time": hours,
+                    "temperature_2m": [lat] * len(hours),
+                    "apparent_temperature": [lat] * len(hours),
+                    "weathercode": [3] * len(hours),
+                    "precipitation": [0.0] * len(hours),
+                    "precipitation_probability": [0] * len(hours),
+                },
+                "minutely_15": {"time": [now + i * 900 for i in range(-1, 13)], "precipitation": [0.0] * 14},
+                "daily": {"time": [now - now % 86400], "temperature_2m_max": [lat], "temperature_2m_min": [lat],
+                          "weathercode": [3], "precipitation_sum": [0.0]},
+            }
+            for lat, lon in zip(lats, lons)
+        ]
+        return answers if len(answers) > 1 else answers[0]
+
+
+def _serve(fake: FakeOpenMeteo) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            payload = json.dumps(fake.answer(parse_qs(urlparse(self.path).query))).encode()
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    cities = int(sys.argv[1]) if len(sys.argv) > 1 else CITIES
+    fake = FakeOpenMeteo()
+    server = _serve(fake)
+    forecast.FORECAST_URL = f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+
+    screens = []
+    for i in range(cities):
+        lat, lon = 58.0 + i, 26.0 + i
+        # Two panels showing the same cities: the second one's screens only
+        # ever get cache hits.
+        for _ in range(2):
+            screens += [WeatherScreen(lat, lon), WeatherGraphScreen(lat, lon), RainScreen(lat, lon)]
+    for screen in screens:
+        screen.ttl = TTL
+
+    with ThreadPoolExecutor(MAX_WORKERS) as pool:
+        for round_ in range(ROUNDS):
+            before = len(fake.requests)
+            start = time.perf_counter()
+            list(pool.map(lambda screen: screen.prefetch(), screens))
+            elapsed = time.perf_counter() - start
+            sent = fake.requests[before:]
+            print(
+                f"round {round_ + 1}: {len(screens)} screens, {len(sent)} request(s) "
+                f"for {sum(sent)} locations in {elapsed * 1000:.0f} ms "
+                f"(one request per screen: {len(screens)} x {LATENCY * 1000:.0f} ms)"
+            )
+            for screen in screens:
+                assert screen.forecast["hourly"]["temperature_2m"][0] == round(screen.lat, 4), screen
+            time.sleep(TTL)
+
+    print(forecast.OPEN_METEO.stats())
+    server.shutdown()
+    http_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Startup cost with the GIF backend: time from interpreter start to the first
+frame reaching the device, and peak RSS at that point. Runs `main.py --gif`
+in fresh subprocesses with the project's config.json, once as is (only the
+configured screens are imported) and once with every screen module and heavy
+dependency imported up front, as startup used to.
+
+    python -m benchmarks.startup [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = 5
+SCREEN_MODULES = ["adsb", "bf6", "cpu", "date", "lan", "map", "satellites", "smart_bikes", "strava", "weather"]
+EAGER_IMPORTS = ["httpx", "psutil", "dotenv"] + [f"screens.{name}" for name in SCREEN_MODULES]
+
+# Runs in the child: stops at the first device.display() call and reports.
+CHILD = """
+import importlib, json, os, resource, runpy, sys, time
+start = time.perf_counter()
+for module in {eager!r}:
+    importlib.import_module(module)
+from luma.emulator.device import gifanim
+def first_frame(self, image):
+    print(json.dumps({{
+        "seconds": time.perf_counter() - start,
+        "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "modules": len(sys.modules),
+    }}), flush=True)
+    os._exit(0)
+gifanim.display = first_frame
+sys.argv = ["main.py", "--gif", {gif!r}]
+runpy.run_path("main.py", run_name="__main__")
+"""
+
+
+def _run(eager: list[str], gif: str) -> dict:
+    code = CHILD.format(eager=eager, gif=gif)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    if out.returncode != 0:
+        sys.exit(f"main.py failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if not (ROOT / "config.json").exists():
+        sys.exit("needs a config.json (see config.example.json)")
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    configured = json.loads((ROOT / "config.json").read_text())["screens"]
+    print(f"{runs} runs, screens: {', '.join(configured)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        gif = os.path.join(tmp, "startup.gif")
+        for label, eager in [("lazy", []), ("eager imports", EAGER_IMPORTS)]:
+            results = [_run(eager, gif) for _ in range(runs)]
+            seconds = statistics.median(r["seconds"] for r in results)
+            rss = statistics.median(r["rss_kb"] for r in results) / 1024
+            modules = statistics.median(r["modules"] for r in results)
+            print(f"{label:<14} first frame {seconds * 1000:7.1f} ms, peak RSS {rss:6.1f} MiB, {modules:.0f} modules")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Incremental Strava activity sync and local aggregation on a synthetic
+multi-year history.
+
+Syncs the history from a fake /athlete/activities (no network) to count the
+requests of a first and a steady-state sync, then times the local work done
+on every refresh: loading the store, summarize(), and weekly/monthly totals.
+
+    python -m benchmarks.strava_activities [years]
+"""
+
+import random
+import sys
+import tempfile
+import time
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from screens.strava_activities import ActivityStore, daily_distance, monthly_totals, summarize, weekly_totals
+
+YEARS = 8
+ACTIVITIES_PER_DAY = 1.3
+SPORT_TYPES = ["Ride", "Ride", "Ride", "VirtualRide", "GravelRide", "Run", "Walk"]
+ROUNDS = 20
+
+
+def _history(years: int, end: datetime) -> list[dict]:
+    random.seed(1)
+    activities = []
+    start = end - timedelta(days=365 * years)
+    for i in range(int(365 * years * ACTIVITIES_PER_DAY)):
+        when = start + timedelta(seconds=random.uniform(0, (end - start).total_seconds()))
+        activities.append({
+            "id": 10_000_000 + i,
+            "start_date": when.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "start_date_local": (when + timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "sport_type": random.choice(SPORT_TYPES),
+            "distance": random.uniform(3_000, 120_000),
+            "moving_time": random.randint(600, 6 * 3600),
+            "total_elevation_gain": random.uniform(0, 1500),
+        })
+    activities.sort(key=lambda a: a["start_date"])
+    return activities
+
+
+class FakeActivitiesApi:
+    """/athlete/activities over a list: `after` filter, ascending, paged."""
+
+    def __init__(self, activities: list[dict]):
+        self.activities = activities
+        self.requests = 0
+
+    def __call__(self, after: int, page: int, per_page: int) -> list[dict]:
+        self.requests += 1
+        matching = [
+            a for a in self.activities
+            if datetime.fromisoformat(a["start_date"].replace("Z", "+00:00")).timestamp() > after
+        ]
+        return matching[(page - 1) * per_page : page * per_page]
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else YEARS
+    now = datetime.now(timezone.utc)
+    history = _history(years, now - timedelta(days=1))
+    api = FakeActivitiesApi(history)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "activities.json"
+        store = ActivityStore(path)
+        start = time.perf_counter()
+        changed, requests = store.sync(api)
+        first = time.perf_counter() - start
+        print(f"{years} years, {len(history)} activities; first sync: {requests} requests, {first * 1000:.0f} ms")
+
+        history.append({**history[-1], "id": 99_999_999, "start_date": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                        "start_date_local": now.strftime("%Y-%m-%dT%H:%M:%SZ")})
+        changed, requests = store.sync(api)
+        print(f"next sync: {requests} request, {changed} new; store file {path.stat().st_size / 1024:.0f} KiB")
+        assert changed == 1 and requests == 1 and len(store) == len(history)
+
+        today = date.today()
+        timings = [
+            ("load store", lambda: ActivityStore(path)),
+            ("summarize", lambda: summarize(store, today, "ytd", 5000)),
+            ("weekly totals", lambda: weekly_totals(daily_distance(store))),
+            ("monthly totals", lambda: monthly_totals(daily_distance(store))),
+        ]
+        for label, fn in timings:
+            seconds = timeit.timeit(fn, number=ROUNDS) / ROUNDS
+            print(f"{label:<15} {seconds * 1000:8.2f} ms")
+        print(summarize(store, today, "ytd", 5000))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,169 @@
 import threading
 import time
-
-
-class ButtonController:
-    BUTTON_MAP = {
-        20: 0,  # KEY2 -> screen index 0
-        16: 1,  # KEY3 -> screen index 1
-    }
-
-    def __init__(self):
+from abc import ABC, abstractmethod
+
+# Long press: held at least this long. Double press: second press within this
+# long of the first release. Debounce: edges this soon after an accepted one
+# are contact bounce.
+LONG_PRESS = 0.8
+DOUBLE_PRESS = 0.3
+DEBOUNCE = 0.03
+
+# pin -> {gesture: action}. Gestures are "press", "long" and "double"; actions
+# are a screen index or "next" / "prev". Pins are BCM numbers of the HAT keys.
+DEFAULT_BUTTON_MAP = {
+    21: {"press": "next", "long": "prev"},  # KEY1
+    20: {"press": 0},  # KEY2 -> screen index 0
+    16: {"press": 1},  # KEY3 -> screen index 1
+}
+
+
+class GestureDetector:
+    """
+    Turns the edges of one button into "press", "long" and "double" gestures.
+
+    Pure logic with explicit timestamps, so it can be driven by GPIO callbacks,
+    a simulation or a test. `edge(now)` is called on every edge, `poll(now,
+    pressed)` whenever `deadline()` has passed. Gestures that aren't enabled
+    cost no latency: without "long" and "double", a press is reported on the
+    down edge itself.
+    """
+
+    def __init__(self, long_press: float | None = LONG_PRESS, double_press: float | None = DOUBLE_PRESS, debounce: float = DEBOUNCE):
+        # None disables the gesture.
+        self.long_press = long_press
+        self.double_press = double_press
+        self.debounce = debounce
+        self.pressed = False
+        self._quiet_until = 0.0
+        self._down_at: float | None = None  # set while a press may still become long
+        self._consumed = False  # current press already reported (long / double / immediate)
+        self._single_until: float | None = None  # a release waiting for a possible second press
+
+    def edge(self, now: float) -> list[str]:
+        # The first edge after a quiet period flips the state right away;
+        # edges during the bounce that follows are ignored and the real level
+        # is read once it's over (see poll()).
+        if now < self._quiet_until:
+            return []
+        self._quiet_until = now + self.debounce
+        return self._set(not self.pressed, now)
+
+    def poll(self, now: float, pressed: bool) -> list[str]:
+        gestures = []
+        if now >= self._quiet_until and pressed != self.pressed:
+            gestures += self._set(pressed, now)
+        if self._down_at is not None and self.long_press is not None and now - self._down_at >= self.long_press:
+            self._down_at = None
+            self._consumed = True
+            gestures.append("long")
+        if self._single_until is not None and now >= self._single_until:
+            self._single_until = None
+            gestures.append("press")
+        if now >= self._quiet_until:
+            self._quiet_until = 0.0  # bounce window over and reconciled
+        return gestures
+
+    def deadline(self) -> float | None:
+        """Next time poll() has something to do, or None while idle."""
+        times = [self._quiet_until] if self._quiet_until else []
+        if self._down_at is not None and self.long_press is not None:
+            times.append(self._down_at + self.long_press)
+        if self._single_until is not None:
+            times.append(self._single_until)
+        return min(times) if times else None
+
+    def _set(self, pressed: bool, now: float) -> list[str]:
+        self.pressed = pressed
+        if pressed:
+            if self._single_until is not None:
+                self._single_until = None
+                self._consumed = True
+                return ["double"]
+            if self.long_press is None and self.double_press is None:
+                self._consumed = True
+                return ["press"]
+            self._consumed = False
+            self._down_at = now
+            return []
+
+        self._down_at = None
+        if self._consumed:
+            return []
+        if self.double_press is not None:
+            self._single_until = now + self.double_press
+            return []
+        return ["press"]
+
+
+class ButtonController(ABC):
+    """
+    Maps button gestures to screen actions for the main loop.
+
+    Backends report edges through `_edge(pin)` and read levels through
+    `_read(pin)`. A single timer thread handles debounce and gesture timeouts;
+    it only wakes when a detector has a deadline, so an idle device doesn't
+    poll at all. `wait()` returns True once an action is ready for `take_action()`.
+    """
+
+    def __init__(self, button_map=None, long_press=LONG_PRESS, double_press=DOUBLE_PRESS, debounce=DEBOUNCE):
+        self.button_map = {int(pin): gestures for pin, gestures in (button_map or DEFAULT_BUTTON_MAP).items()}
         self.interrupt = threading.Event()
-        self.target_index: int | None = None
+        self._action = None
+        # time.monotonic() when the pending action was detected, for latency stats.
+        self.action_at: float | None = None
+        self._detectors = {
+            pin: GestureDetector(
+                long_press if "long" in gestures else None,
+                double_press if "double" in gestures else None,
+                debounce,
+            )
+            for pin, gestures in self.button_map.items()
+        }
+        self._cond = threading.Condition()
         self._running = True
-        self._setup_gpio()
-        self._poll_thread = threading.Thread(target=self._poll, daemon=True)
-        self._poll_thread.start()
-
-    def _setup_gpio(self):
-        import RPi.GPIO as GPIO
-
-        GPIO.setwarnings(False)
-        GPIO.setmode(GPIO.BCM)
-        for pin in self.BUTTON_MAP:
-            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-
-    def _poll(self):
-        import RPi.GPIO as GPIO
-
-        prev = {pin: GPIO.HIGH for pin in self.BUTTON_MAP}
-        while self._running:
-            for pin, index in self.BUTTON_MAP.items():
-                state = GPIO.input(pin)
-                if prev[pin] == GPIO.HIGH and state == GPIO.LOW:
-                    self.target_index = index
-                    self.interrupt.set()
-                prev[pin] = state
-            time.sleep(0.02)
+        self._timer = threading.Thread(target=self._run, name="buttons", daemon=True)
+        self._timer.start()
+
+    @abstractmethod
+    def _read(self, pin: int) -> bool:
+        # True while the button is held.
+        ...
+
+    def _edge(self, pin: int) -> None:
+        with self._cond:
+            self._fire(pin, self._detectors[pin].edge(time.monotonic()))
+            self._cond.notify()
+
+    def _run(self):
+        with self._cond:
+            while self._running:
+                deadlines = [d for d in (det.deadline() for det in self._detectors.values()) if d is not None]
+                if deadlines:
+                    self._cond.wait(max(min(deadlines) - time.monotonic(), 0.0))
+                else:
+                    self._cond.wait()
+                now = time.monotonic()
+                for pin, detector in self._detectors.items():
+                    if detector.deadline() is not None and detector.deadline() <= now:
+                        self._fire(pin, detector.poll(now, self._read(pin)))
+
+    def _fire(self, pin: int, gestures: list[str]):
+        for gesture in gestures:
+            action = self.button_map[pin].get(gesture)
+            if action is not None:
+                self._action = action
+                self.action_at = time.monotonic()
+                self.interrupt.set()
+
+    def take_action(self):
+        """The last requested action (screen index, "next" or "prev"), or None; clears it."""
+        action, self._action = self._action, None
+        return action
+
+    def wake(self):
+        """Make wait() return early without an action (e.g. new data to draw)."""
+        self.interrupt.set()
 
     def wait(self, timeout: float):
         self.interrupt.wait(timeout)
@@ -45,25 +173,81 @@ class ButtonController:
         return False
 
     def cleanup(self):
-        self._running = False
-        import RPi.GPIO as GPIO
-
-        GPIO.cleanup([20, 16])
+        with self._cond:
+            self._running = False
+            self._cond.notify()
 
 
-class DummyButtonController:
-    def __init__(self):
-        self.target_index = None
+class GpioButtonController(ButtonController):
+    """Buttons on RPi.GPIO edge interrupts (active low, internal pull-ups)."""
 
-    def wait(self, timeout: float):
-        time.sleep(timeout)
-        return False
+    def __init__(self, *args, **kwargs):
+        import RPi.GPIO as GPIO
 
-    def cleanup(self):
-        pass
+        self._gpio = GPIO
+        super().__init__(*args, **kwargs)
+        GPIO.setwarnings(False)
+        GPIO.setmode(GPIO.BCM)
+        for pin in self.button_map:
+            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            # Both edges, no hardware bouncetime: it would swallow the release
+            # edge of a short press. GestureDetector debounces instead.
+            GPIO.add_event_detect(pin, GPIO.BOTH, callback=self._edge)
 
+    def _read(self, pin: int) -> bool:
+        return self._gpio.input(pin) == self._gpio.LOW
 
-def create_buttons(is_hardware: bool):
+    def cleanup(self):
+        super().cleanup()
+        for pin in self.button_map:
+            self._gpio.remove_event_detect(pin)
+        self._gpio.cleanup(list(self.button_map))
+
+
+class SimulatedButtonController(ButtonController):
+    """
+    No hardware: buttons are pressed from code (emulator, tests).
+
+    `press(pin)` / `release(pin)` produce the same edges GPIO would;
+    `bounce=True` adds contact chatter.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._levels: dict[int, bool] = {}
+        super().__init__(*args, **kwargs)
+
+    def _read(self, pin: int) -> bool:
+        return self._levels.get(pin, False)
+
+    def _set_level(self, pin: int, pressed: bool, bounce: bool):
+        if bounce:
+            for level in (pressed, not pressed, pressed, not pressed):
+                self._levels[pin] = level
+                self._edge(pin)
+        self._levels[pin] = pressed
+        self._edge(pin)
+
+    def press(self, pin: int, bounce: bool = False):
+        self._set_level(pin, True, bounce)
+
+    def release(self, pin: int, bounce: bool = False):
+        self._set_level(pin, False, bounce)
+
+    def click(self, pin: int, hold: float = 0.05):
+        self.press(pin)
+        time.sleep(hold)
+        self.release(pin)
+
+
+def create_buttons(is_hardware: bool, config: dict | None = None):
+    # config: the "buttons" section of config.json; times are in milliseconds.
+    config = config or {}
+    options = dict(
+        button_map=config.get("map"),
+        long_press=config.get("long_press_ms", LONG_PRESS * 1000) / 1000,
+        double_press=config.get("double_press_ms", DOUBLE_PRESS * 1000) / 1000,
+        debounce=config.get("debounce_ms", DEBOUNCE * 1000) / 1000,
+    )
     if is_hardware:
-        return ButtonController()
-    return DummyButtonController()
+        return GpioButtonController(**options)
+    return SimulatedButtonController(**options)
@@ -1,3 +1,13 @@
+from PIL import Image
+
+# SH1106 RAM is 132 columns wide; a 128-pixel panel starts at column 2
+# (luma.oled's default page_address_offset).
+SH1106_COLUMN_OFFSET = 0x02
+# Bytes of command overhead per partial page write: page address plus the
+# low and high column address nibbles.
+_PAGE_COMMAND_BYTES = 3
+
+
 def create_device(emulator=False, gif_file=None):
     # Check for GIF request first
     if gif_file:
@@ -24,3 +34,91 @@ def is_raspberry_pi():
             return "raspberry pi" in f.read().lower()
     except FileNotFoundError:
         return False
+
+
+def to_pages(image: Image.Image) -> list[bytes]:
+    """Pack a mode "1" image into SH1106 pages: one byte per column, 8 rows per page, LSB on top."""
+    # Rotating clockwise turns each column into a row of packed bits, with the
+    # bottom pixel in the MSB of the first byte. Reading every 8th byte from the
+    # end then yields one page per slice without touching individual pixels.
+    raw = image.transpose(Image.Transpose.ROTATE_270).tobytes()
+    stride = image.height // 8
+    return [raw[stride - 1 - page :: stride] for page in range(stride)]
+
+
+class FrameDiffer:
+    """
+    Sits between the screens and the device and only sends what changed.
+
+    Looks like a luma device to `canvas()` (it has `mode`, `size` and
+    `display()`), keeps the last flushed frame as SH1106 pages, and for every
+    new frame compares page by page. With `partial=True` (real SH1106), only
+    the changed column range of each changed page is written over SPI.
+    Otherwise (emulator / GIF) the full frame is handed to the device as before,
+    but the byte counters still record what a partial push would have cost.
+    """
+
+    def __init__(self, device, partial: bool = False):
+        self.device = device
+        self.partial = partial
+        self.mode = device.mode
+        self.size = device.size
+        self.width = device.width
+        self.height = device.height
+        self._pages: list[bytes] | None = None
+        self.frames = 0
+        self.bytes_sent = 0
+        self.bytes_full = 0
+
+    def display(self, image: Image.Image) -> None:
+        self._push(to_pages(self.device.preprocess(image)), lambda: image)
+
+    def display_pages(self, buffer) -> None:
+        """Same as display() for a `pagebuffer.PageBuffer`: its bytes go out as they are."""
+        # Only the emulator / GIF devices still need an image.
+        self._push(buffer.device_pages(getattr(self.device, "rotate", 0)), buffer.to_image)
+
+    def _push(self, pages: list[bytes], image) -> None:
+        # `image` is a callable returning the frame as a Pillow image, for the
+        # non-partial path.
+        prev = self._pages
+        self._pages = pages
+        self.frames += 1
+        self.bytes_full += sum(len(p) + _PAGE_COMMAND_BYTES for p in pages)
+
+        spans = []
+        for page, data in enumerate(pages):
+            if prev is not None and prev[page] == data:
+                continue
+            start, end = _changed_span(prev[page] if prev else None, data)
+            spans.append((page, start, end))
+            self.bytes_sent += (end - start) + _PAGE_COMMAND_BYTES
+
+        if not self.partial:
+            if spans:
+                self.device.display(image())
+            return
+
+        for page, start, end in spans:
+            column = start + SH1106_COLUMN_OFFSET
+            self.device.command(0xB0 + page, column & 0x0F, 0x10 | (column >> 4))
+            self.device.data(list(pages[page][start:end]))
+
+    def stats(self) -> str:
+        if not self.bytes_full:
+            return "no frames flushed"
+        pct = self.bytes_sent / self.bytes_full * 100
+        return f"{self.frames} frames, {self.bytes_sent}/{self.bytes_full} bytes pushed ({pct:.1f}%)"
+
+
+def _changed_span(old: bytes | None, new: bytes) -> tuple[int, int]:
+    """Return the [start, end) column range where `new` differs from `old`."""
+    if old is None:
+        return 0, len(new)
+    start = 0
+    while old[start] == new[start]:
+        start += 1
+    end = len(new)
+    while old[end - 1] == new[end - 1]:
+        end -= 1
+    return start, end
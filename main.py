@@ -1,12 +1,89 @@
 import argparse
-import threading
+import signal
+import sys
 import time
 
-from luma.core.render import canvas
-
 from buttons import create_buttons
-from device import create_device, is_raspberry_pi
-from screens import all_screens
+from device import FrameDiffer, create_device, is_raspberry_pi
+from scheduler import FrameScheduler, PrefetchScheduler
+from screens import all_screens, button_config, http_client, snapshot_config, sources
+from screens.metrics import RingBuffer
+from snapshots import create_snapshot_store
+
+# Button-press-to-frame latencies kept for the stats printed on Ctrl+C.
+LATENCY_HISTORY = 256
+
+
+class InputLatency:
+    """Time from a button action to the first frame of its target screen being flushed."""
+
+    def __init__(self):
+        self._samples = RingBuffer(LATENCY_HISTORY)
+        self.worst = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.worst = max(self.worst, seconds)
+
+    def percentile(self, p: float) -> float | None:
+        return self._samples.percentile(p)
+
+    def stats(self) -> str:
+        if not len(self._samples):
+            return "no button presses"
+        return (
+            f"{len(self._samples)} presses, input-to-frame latency p50 {self.percentile(50) * 1000:.1f} ms, "
+            f"p95 {self.percentile(95) * 1000:.1f} ms, max {self.worst * 1000:.1f} ms"
+        )
+
+
+def run_loop(screens, show, buttons, scheduler, frames, latency, stop=None):
+    """
+    Cycle through `screens` until `stop` (a threading.Event) is set.
+
+    A button action switches screens at once: the target's last frame (or its
+    cached data) is shown without waiting for anything, and the scheduler
+    refreshes it in the background. When a refresh lands while its screen is
+    up, the scheduler's `on_refresh` wakes this loop through `buttons.wake()`
+    and the screen is redrawn for the rest of its interval.
+    """
+    i = 0
+    action_at = None
+    while stop is None or not stop.is_set():
+        screen = screens[i]
+        screen.on_show()
+        until = time.monotonic() + screen.interval
+
+        while True:
+            if screen.live:
+                interrupted = frames.run(screen, show, until, first_frame=lambda: _first_frame(latency, action_at))
+            else:
+                show(screen)
+                _first_frame(latency, action_at)
+                interrupted = buttons.wait(max(until - time.monotonic(), 0.0))
+            action_at = None
+            if not interrupted:
+                action = None
+                break
+            action = buttons.take_action()
+            if action is not None:
+                action_at = buttons.action_at
+                break
+            # Woken by fresh data, not a button: redraw and keep the remaining time.
+
+        if action is None or action == "next":
+            i = (i + 1) % len(screens)
+        elif action == "prev":
+            i = (i - 1) % len(screens)
+        else:
+            i = action % len(screens)
+        if action is not None:
+            scheduler.refresh_now(screens[i])
+
+
+def _first_frame(latency, action_at):
+    if action_at is not None:
+        latency.record(time.monotonic() - action_at)
 
 
 def main():
@@ -21,52 +98,74 @@ def main():
         type=str,
         help="Save animation to a GIF file (e.g., output.gif). Overrides --emulator.",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["pil", "pages"],
+        default="pil",
+        help="Frame backend: Pillow images (default) or numpy SH1106 page buffers",
+    )
     args = parser.parse_args()
 
     device = create_device(emulator=args.emulator, gif_file=args.gif)
     hardware = not args.emulator and not args.gif and is_raspberry_pi()
-    buttons = create_buttons(hardware)
+    buttons = create_buttons(hardware, button_config)
+    # Screens draw into `display`, which forwards only the changed pages to `device`.
+    display = FrameDiffer(device, partial=hardware)
+    if args.backend == "pages":
+        from pagebuffer import PageBuffer
 
-    try:
-        all_screens[0].prefetch()
-        i = 0
+        pages = PageBuffer(*display.size)
 
-        while True:
-            screen = all_screens[i]
+        def show(screen):
+            # Screens with compose() write into the page buffer directly; the
+            # rest are drawn with Pillow and packed.
+            if not screen.compose(pages):
+                pages.load_image(screen.render(display.size, display.mode))
+            display.display_pages(pages)
+    else:
 
-            next_i = (i + 1) % len(all_screens)
-            prefetch_thread = threading.Thread(
-                target=all_screens[next_i].prefetch, daemon=True
-            )
-            prefetch_thread.start()
+        def show(screen):
+            display.display(screen.render(display.size, display.mode))
 
-            interrupted = False
-            if screen.live:
-                deadline = time.monotonic() + screen.interval
-                while time.monotonic() < deadline:
-                    with canvas(device) as draw:
-                        screen.draw(draw, device.width, device.height)
-                    interrupted = buttons.wait(0.5)
-                    if interrupted:
-                        break
-            else:
-                with canvas(device) as draw:
-                    screen.draw(draw, device.width, device.height)
-                interrupted = buttons.wait(screen.interval)
+    # Last data from before a restart, so screens aren't blank until their
+    # first fetch. Restored before the scheduler starts: data that is still
+    # fresh isn't fetched again.
+    snapshots = create_snapshot_store(snapshot_config)
+    if snapshots is not None:
+        snapshots.restore(all_screens)
 
-            prefetch_thread.join()
+    def on_refresh(screen):
+        if snapshots is not None:
+            snapshots.save(screen)
+        buttons.wake()
 
-            if interrupted and buttons.target_index is not None:
-                target = buttons.target_index
-                buttons.target_index = None
-                all_screens[target].prefetch()
-                i = target
-            else:
-                i = next_i
+    # Refreshes every screen's data in the background; drawing never waits on it.
+    scheduler = PrefetchScheduler(all_screens, on_refresh=on_refresh)
+    scheduler.start()
+    # Paces live screens at their own frame rate (Screen.next_frame_at()).
+    frames = FrameScheduler(buttons.wait)
+    latency = InputLatency()
+    # systemd stops the service with SIGTERM; exit through the finally block
+    # below so pending snapshots are written.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        run_loop(all_screens, show, buttons, scheduler, frames, latency)
     except KeyboardInterrupt:
-        pass
+        if not hardware:
+            print(display.stats())
+            print(frames.stats())
+            print(latency.stats())
+            for screen in all_screens:
+                print(screen.cache_stats())
+            for source in sources.registered():
+                print(source.stats())
     finally:
+        scheduler.stop()
+        http_client.close()
         buttons.cleanup()
+        if snapshots is not None:
+            snapshots.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+"""
+Optional rendering backend: the frame kept as SH1106 pages in a NumPy array.
+
+Each byte is one column of 8 rows, LSB on top, which is exactly what the
+panel's RAM holds, so a finished frame goes to SPI without any conversion.
+Screens that implement `compose()` write into it with bit operations on
+pre-packed bitmaps; the others still draw with Pillow and are packed once
+per new frame. Needs numpy, the `pages` extra (pip install ".[pages]" or
+uv sync --extra pages).
+"""
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError('--backend pages needs numpy: pip install ".[pages]" (or uv sync --extra pages)') from e
+
+# Byte with its bit order reversed, for 180° rotation (LSB-on-top becomes MSB-on-top).
+_REVERSED_BITS = np.array([int(f"{b:08b}"[::-1], 2) for b in range(256)], dtype=np.uint8)
+
+
+def pack(image: Image.Image) -> np.ndarray:
+    """Pack a mode "1" image into a (pages, width) uint8 array of SH1106 page bytes."""
+    pixels = np.asarray(image.convert("1"), dtype=bool)
+    height, width = pixels.shape
+    pages = -(-height // 8)
+    if height % 8:
+        pixels = np.vstack([pixels, np.zeros((pages * 8 - height, width), dtype=bool)])
+    # (pages, 8 rows, width) -> (pages, width, 8 rows) -> one byte per column.
+    bits = pixels.reshape(pages, 8, width).transpose(0, 2, 1)
+    return np.packbits(bits, axis=2, bitorder="little")[:, :, 0]
+
+
+class PageBuffer:
+    """A width x height 1-bit frame as (height // 8, width) page bytes."""
+
+    def __init__(self, width: int = 128, height: int = 64):
+        if height > 64 or height % 8:
+            raise ValueError("height must be a multiple of 8, at most 64")
+        self.width = width
+        self.height = height
+        self.pages = np.zeros((height // 8, width), dtype=np.uint8)
+        self._loaded_image: Image.Image | None = None
+
+    def clear(self) -> None:
+        self.pages.fill(0)
+        self._loaded_image = None
+
+    def load(self, packed: np.ndarray) -> None:
+        """Replace the whole frame with a packed one of the same size."""
+        np.copyto(self.pages, packed)
+        self._loaded_image = None
+
+    def load_image(self, image: Image.Image) -> None:
+        """Replace the frame with a Pillow image, skipping the packing if it's the same object as last time."""
+        # Screen.render() hands back the very same image while its frame cache
+        # holds, so an unchanged frame isn't packed again.
+        if image is not self._loaded_image:
+            np.copyto(self.pages, pack(image))
+            self._loaded_image = image
+
+    def blit(self, packed: np.ndarray, x: int, y: int) -> None:
+        """OR a packed bitmap into the frame with its top-left corner at (x, y)."""
+        self._loaded_image = None
+        rows, cols = packed.shape
+        left, right = max(x, 0), min(x + cols, self.width)
+        first, last = max(y // 8, 0), min((y + rows * 8 - 1) // 8, len(self.pages) - 1)
+        if left >= right or first > last:
+            return
+        # Each column of the bitmap as one 64-bit word (frames are at most 64
+        # rows), moved to row y with a single shift and split back into pages.
+        words = np.zeros(right - left, dtype=np.uint64)
+        for page in range(rows):
+            words |= packed[page, left - x : right - x].astype(np.uint64) << np.uint64(8 * page)
+        words = words << np.uint64(y) if y >= 0 else words >> np.uint64(-y)
+        for page in range(first, last + 1):
+            self.pages[page, left:right] |= ((words >> np.uint64(8 * page)) & np.uint64(0xFF)).astype(np.uint8)
+
+    def device_pages(self, rotate: int = 0) -> list[bytes]:
+        """Page bytes as the panel expects them, for luma's `rotate` 0 or 2 (180°)."""
+        pages = self.pages
+        if rotate == 2:
+            pages = _REVERSED_BITS[pages[::-1, ::-1]]
+        elif rotate != 0:
+            raise ValueError("the page buffer supports rotate=0 and rotate=2 only")
+        return [row.tobytes() for row in pages]
+
+    def to_image(self) -> Image.Image:
+        bits = np.unpackbits(self.pages[:, :, np.newaxis], axis=2, bitorder="little")
+        pixels = bits.transpose(0, 2, 1).reshape(-1, self.width)[: self.height]
+        return Image.fromarray(pixels.astype(bool))
@@ -0,0 +1,145 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from screens.base import Screen
+from screens.metrics import RingBuffer
+
+# Upper bound on prefetches running at the same time. A hung request only
+# ties up one worker; every other screen keeps refreshing on its own cadence.
+MAX_WORKERS = 4
+# Frame times kept for the percentiles in FrameScheduler.stats().
+FRAME_TIME_HISTORY = 512
+
+
+class PrefetchScheduler:
+    """
+    Keeps every screen's data fresh in the background.
+
+    Each screen that overrides `fetch()` gets its `prefetch()` called on a
+    bounded worker pool whenever its data goes stale (`screen.ttl`, or the
+    failure backoff), independently of what is on the display.
+    The main loop only ever draws whatever the screens last stored, so a slow
+    upstream delays that screen's data, never a screen transition.
+    """
+
+    def __init__(self, screens: list[Screen], max_workers: int = MAX_WORKERS, on_refresh: Callable[[Screen], None] | None = None):
+        # on_refresh(screen) is called from a worker after a fetch stored new data.
+        self._on_refresh = on_refresh
+        self._screens = [s for s in screens if type(s).fetch is not Screen.fetch]
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._due: dict[int, float] = {id(s): 0.0 for s in self._screens}
+        self._in_flight: set[int] = set()
+        self._running = False
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self) -> None:
+        self._running = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        # Under the lock _loop() submits with, so it can't submit to the pool
+        # after it has been shut down.
+        with self._lock:
+            self._running = False
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._wake.set()
+
+    def refresh_now(self, screen: Screen) -> None:
+        # Runs the screen's prefetch() as soon as possible without waiting for
+        # it. Fresh data is a cache hit; stale data gets revalidated.
+        if id(screen) in self._due:
+            with self._lock:
+                self._due[id(screen)] = 0.0
+            self._wake.set()
+
+    def _loop(self):
+        while self._running:
+            now = time.monotonic()
+            with self._lock:
+                if not self._running:
+                    break
+                for screen in self._screens:
+                    key = id(screen)
+                    if key not in self._in_flight and self._due[key] <= now:
+                        self._in_flight.add(key)
+                        self._pool.submit(self._refresh, screen)
+                waiting = [self._due[id(s)] for s in self._screens if id(s) not in self._in_flight]
+            # Sleep until the next screen is due, or until a refresh finishes
+            # or refresh_now() is called.
+            timeout = min(waiting) - now if waiting else None
+            self._wake.wait(timeout=max(timeout, 0) if timeout is not None else None)
+            self._wake.clear()
+
+    def _refresh(self, screen: Screen):
+        fetched_at = screen.fetched_at
+        try:
+            screen.prefetch()
+            if self._on_refresh is not None and screen.fetched_at != fetched_at:
+                self._on_refresh(screen)
+        finally:
+            with self._lock:
+                self._in_flight.discard(id(screen))
+                self._due[id(screen)] = time.monotonic() + screen.next_fetch_in()
+            self._wake.set()
+
+
+class FrameScheduler:
+    """
+    Paces the frames of a live screen.
+
+    Draws a frame, then sleeps exactly until `screen.next_frame_at()` (or until
+    `wait` reports a button press). Frames whose time passed while the previous
+    one was still being drawn are skipped and counted as dropped, so a slow
+    frame never makes the following ones late.
+    """
+
+    def __init__(self, wait: Callable[[float], bool]):
+        # wait(seconds) -> True if interrupted (e.g. ButtonController.wait).
+        self._wait = wait
+        self.frames = 0
+        self.dropped = 0
+        self._frame_times = RingBuffer(FRAME_TIME_HISTORY)
+        self._worst = 0.0
+
+    def run(self, screen: Screen, show: Callable[[Screen], None], until: float, first_frame: Callable[[], None] | None = None) -> bool:
+        """Show `screen` until time.monotonic() reaches `until`. Returns True if interrupted.
+
+        `first_frame` is called right after the first frame has been shown.
+        """
+        due = time.monotonic()
+        while True:
+            start = time.monotonic()
+            if start >= until:
+                return False
+            show(screen)
+            end = time.monotonic()
+            self._record(end - start)
+            if first_frame is not None:
+                first_frame()
+                first_frame = None
+
+            due = screen.next_frame_at(due)
+            while due <= end:
+                self.dropped += 1
+                due = screen.next_frame_at(due)
+            if self._wait(max(min(due, until) - time.monotonic(), 0.0)):
+                return True
+
+    def _record(self, seconds: float):
+        self.frames += 1
+        self._frame_times.append(seconds)
+        self._worst = max(self._worst, seconds)
+
+    def stats(self) -> str:
+        if not self.frames:
+            return "no live frames"
+        p50 = self._frame_times.percentile(50) * 1000
+        p95 = self._frame_times.percentile(95) * 1000
+        return (
+            f"{self.frames} live frames, {self.dropped} dropped, frame time "
+            f"p50 {p50:.2f} ms, p95 {p95:.2f} ms, max {self._worst * 1000:.2f} ms"
+        )
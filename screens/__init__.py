@@ -1,38 +1,82 @@
+import importlib
 import json
+import os
 from pathlib import Path
 
-from screens.adsb import AdsbScreen
-from screens.bf6 import Bf6Screen
-from screens.cpu import CpuScreen
-from screens.date import DateScreen
-from screens.lan import LanScreen
-from screens.map import MapScreen
-from screens.satellites import SatellitesScreen
-from screens.smart_bikes import SmartBikesScreen
-from screens.strava import StravaScreen
-from screens.weather import WeatherScreen
-
-_config_path = Path(__file__).resolve().parent.parent / "config.json"
+from screens import http_client
+
+# DISPLAY_HATA_CONFIG points at another config file (the tests use one with
+# no screens).
+_config_path = Path(os.environ.get("DISPLAY_HATA_CONFIG") or Path(__file__).resolve().parent.parent / "config.json")
 with open(_config_path) as f:
     _config = json.load(f)
 
+http_client.configure(**_config.get("http", {}))
+# Read by main.py for buttons.create_buttons().
+button_config = _config.get("buttons", {})
+# Read by main.py for snapshots.create_snapshot_store().
+snapshot_config = _config.get("snapshots", {})
+
+
+def _screen_class(module: str, cls: str):
+    # Screen modules are imported only when the screen is configured, so an
+    # unused screen costs neither import time nor memory at startup.
+    return getattr(importlib.import_module(f"screens.{module}"), cls)
+
+
 _SCREEN_FACTORIES = {
-    "bf6": lambda cfg: Bf6Screen(username=cfg["username"], platform=cfg.get("platform", "pc")),
-    "date": lambda cfg: DateScreen(),
-    "weather": lambda cfg: WeatherScreen(lat=cfg["lat"], lon=cfg["lon"]),
-    "smart_bikes": lambda cfg: SmartBikesScreen(cfg["station"]),
-    "adsb": lambda cfg: AdsbScreen(city=cfg["city"], lat=cfg["lat"], lon=cfg["lon"], radius_km=cfg.get("radius_km", 50)),
-    "cpu": lambda cfg: CpuScreen(),
-    "lan": lambda cfg: LanScreen(),
-    "map": lambda cfg: MapScreen(),
-    "strava": lambda cfg: StravaScreen(goal_km=cfg.get("goal_km", 1000), period=cfg.get("period", "ytd")),
-    "satellites": lambda cfg: SatellitesScreen(lat=cfg["lat"], lon=cfg["lon"], min_elevation=cfg.get("min_elevation", 30)),
+    "bf6": lambda cfg: _screen_class("bf6", "Bf6Screen")(username=cfg["username"], platform=cfg.get("platform", "pc")),
+    "date": lambda cfg: _screen_class("date", "DateScreen")(),
+    "weather": lambda cfg: _screen_class("weather", "WeatherScreen")(
+        lat=cfg["lat"], lon=cfg["lon"], source=cfg.get("source", "current")
+    ),
+    "weather_graph": lambda cfg: _screen_class("weather", "WeatherGraphScreen")(lat=cfg["lat"], lon=cfg["lon"]),
+    "rain": lambda cfg: _screen_class("weather", "RainScreen")(lat=cfg["lat"], lon=cfg["lon"]),
+    "smart_bikes": lambda cfg: _screen_class("smart_bikes", "SmartBikesScreen")(
+        cfg.get("stations") or [cfg["station"]], page_seconds=cfg.get("page_seconds")
+    ),
+    "adsb": lambda cfg: _screen_class("adsb", "AdsbScreen")(
+        city=cfg["city"],
+        lat=cfg["lat"],
+        lon=cfg["lon"],
+        radius_km=cfg.get("radius_km", 50),
+        deadline=cfg.get("deadline"),
+    ),
+    "cpu": lambda cfg: _screen_class("cpu", "CpuScreen")(),
+    "lan": lambda cfg: _screen_class("lan", "LanScreen")(
+        sweep_interval=cfg.get("sweep_interval"), expiry=cfg.get("expiry"), watch=cfg.get("watch", True)
+    ),
+    "map": lambda cfg: _screen_class("map", "MapScreen")(prerender=cfg.get("prerender", True)),
+    "strava": lambda cfg: _screen_class("strava", "StravaScreen")(
+        goal_km=cfg.get("goal_km", 1000),
+        period=cfg.get("period", "ytd"),
+        source=cfg.get("source", "stats"),
+        sport_types=cfg.get("sport_types"),
+    ),
+    "satellites": lambda cfg: _screen_class("satellites", "SatellitesScreen")(
+        lat=cfg["lat"],
+        lon=cfg["lon"],
+        min_elevation=cfg.get("min_elevation", 30),
+        categories=cfg.get("categories"),
+        engine=cfg.get("engine", "n2yo"),
+        tle_sources=cfg.get("tle_sources"),
+        hourly_limit=cfg.get("hourly_limit", 100),
+    ),
 }
 
 all_screens = []
 for name in _config["screens"]:
-    factory = _SCREEN_FACTORIES[name]
+    # "weather:tallinn" is another weather screen, configured in its own
+    # "weather:tallinn" section and named after it (snapshots, stats).
+    kind = name.split(":", 1)[0]
+    factory = _SCREEN_FACTORIES[kind]
     screen_cfg = _config.get(name, {})
     screen = factory(screen_cfg)
+    if name != kind:
+        screen.name = name
     screen.interval = screen_cfg.get("duration", 5)
+    if "ttl" in screen_cfg:
+        screen.ttl = screen_cfg["ttl"]
+    if "fps" in screen_cfg:
+        screen.fps = screen_cfg["fps"]
     all_screens.append(screen)
@@ -1,6 +1,8 @@
-import httpx
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from screens.base import Screen, load_font
+from screens import http_client
+from screens.base import Screen, draw_lines, load_font
+from screens.sources import SharedSource
 
 PROVIDERS = [
     {
@@ -15,40 +17,95 @@ PROVIDERS = [
     },
 ]
 
+# One worker per provider, so every provider is queried at the same time.
+_POOL = ThreadPoolExecutor(max_workers=len(PROVIDERS), thread_name_prefix="adsb")
 
-def _fetch_unique_aircraft_count(lat: float, lon: float, dist_nm: int) -> int:
-    """Fetch from both providers and return count of unique aircraft by hex."""
+
+def _fetch_hexes(provider: dict, lat: float, lon: float, dist_nm: int) -> set[str]:
+    url = provider["url"].format(lat=lat, lon=lon, dist_nm=dist_nm)
+    resp = http_client.client().get(url)
+    resp.raise_for_status()
+    return {ac["hex"] for ac in resp.json().get(provider["key"], []) if ac.get("hex")}
+
+
+def _fetch_unique_aircraft_count(
+    lat: float, lon: float, dist_nm: int, deadline: float | None = None
+) -> tuple[int, list[str]]:
+    """Query all providers at once and count unique aircraft by hex.
+
+    Responses are merged as they arrive. With a `deadline` (seconds), returns
+    whatever has been merged by then; slower providers are left to finish in
+    the background and ignored. Returns (count, names of providers that
+    contributed). A failing provider is skipped; raises only if none answered.
+    """
+    futures = {
+        _POOL.submit(_fetch_hexes, provider, lat, lon, dist_nm): provider["name"]
+        for provider in PROVIDERS
+    }
     seen_hexes: set[str] = set()
+    contributors: list[str] = []
+
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            try:
+                seen_hexes |= future.result()
+            except Exception:
+                continue
+            contributors.append(futures[future])
+    except TimeoutError:
+        pass
 
-    for provider in PROVIDERS:
-        url = provider["url"].format(lat=lat, lon=lon, dist_nm=dist_nm)
-        try:
-            resp = httpx.get(url, timeout=10)
-            resp.raise_for_status()
-            for ac in resp.json().get(provider["key"], []):
-                hex_code = ac.get("hex")
-                if hex_code:
-                    seen_hexes.add(hex_code)
-        except Exception:
-            pass
+    if not contributors:
+        raise RuntimeError("no ADS-B provider answered")
+    return len(seen_hexes), contributors
 
-    return len(seen_hexes)
+
+# Group (dist_nm, deadline), item (lat, lon). The providers take one area
+# per request, so equal areas are deduplicated but not batched.
+_AIRCRAFT = SharedSource(
+    "adsb",
+    lambda group, items: [_fetch_unique_aircraft_count(lat, lon, *group) for lat, lon in items],
+)
 
 
 class AdsbScreen(Screen):
     name = "adsb"
-
-    def __init__(self, city: str, lat: float, lon: float, radius_km: int = 50):
+    ttl = 120.0
+    snapshot_fields = ("count", "providers")
+
+    def __init__(
+        self,
+        city: str,
+        lat: float,
+        lon: float,
+        radius_km: int = 50,
+        deadline: float | None = None,
+    ):
         self.city = city
         self.lat = lat
         self.lon = lon
         self.dist_nm = int(radius_km * 0.539957)
+        # Seconds to wait for providers before going with whoever answered.
+        self.deadline = deadline
 
         self.font = load_font("FreePixel.ttf", 20)
         self.count: int | None = None
+        # Providers whose answers made up the last count.
+        self.providers: list[str] = []
+
+    def snapshot_key(self):
+        return f"{self.lat},{self.lon} {self.dist_nm}nm"
+
+    def fetch(self):
+        # Shared with other adsb screens for the same area (e.g. on another
+        # panel of the same process) within our ttl.
+        fetched_at, (self.count, self.providers) = _AIRCRAFT.get(
+            (self.dist_nm, self.deadline), (self.lat, self.lon), self.ttl
+        )
+        return fetched_at
 
-    def prefetch(self):
-        self.count = _fetch_unique_aircraft_count(self.lat, self.lon, self.dist_nm)
+    def fingerprint(self):
+        return (self.count,)
 
     def draw(self, draw, width, height):
         if self.count is None:
@@ -66,19 +123,4 @@ class AdsbScreen(Screen):
                 f"above {self.city}",
             ]
 
-        spacing = 4
-        bboxes = [draw.textbbox((0, 0), line, font=self.font) for line in lines]
-        heights = [b[3] - b[1] for b in bboxes]
-        widths = [b[2] - b[0] for b in bboxes]
-
-        total_h = sum(heights) + spacing * (len(lines) - 1)
-        y = (height - total_h) // 2
-
-        for i, line in enumerate(lines):
-            draw.text(
-                ((width - widths[i]) // 2, y),
-                line,
-                fill="white",
-                font=self.font,
-            )
-            y += heights[i] + spacing
+        draw_lines(draw, [(line, self.font) for line in lines], width, height, spacing=4)
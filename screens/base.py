@@ -1,20 +1,170 @@
+import string
+import time
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
 
-from PIL import ImageFont
+from PIL import Image, ImageDraw, ImageFont
 
 FONTS_DIR = Path(__file__).resolve().parent.parent / "fonts"
 
+# Scratch canvas for measuring text. Same mode as the display, so the numbers
+# match what draw.textbbox() returns on a real frame.
+_MEASURE = ImageDraw.Draw(Image.new("1", (1, 1)))
 
+
+@lru_cache(maxsize=None)
 def load_font(name: str, size: int) -> ImageFont.FreeTypeFont:
+    # Cached so every screen using the same (font, size) shares one object,
+    # and with it one GlyphAtlas.
     return ImageFont.truetype(str(FONTS_DIR / name), size)
 
 
+@lru_cache(maxsize=1024)
+def text_bbox(text: str, font: ImageFont.FreeTypeFont) -> tuple[int, int, int, int]:
+    """Same as draw.textbbox((0, 0), text, font=font), memoised per (text, font)."""
+    return _MEASURE.textbbox((0, 0), text, font=font)
+
+
+class GlyphAtlas:
+    """
+    1-bit bitmaps of one font's glyphs, rasterised by FreeType once per character.
+
+    Text is drawn by pasting the cached glyphs at their advance positions. For
+    fonts without kerning or fractional advances (FreePixel) that is
+    pixel-identical to ImageDraw.text(), as long as every glyph sits at the
+    same height in any string. Some don't: at some sizes a string containing
+    "õ" or "Õ" is drawn a pixel higher as a whole, depending on which other
+    glyphs it contains.
+
+    The atlas checks this against a probe string when it is built, and every
+    glyph rasterised later against FreeType next to a tall and a low
+    reference glyph. For fonts where it doesn't hold `exact` is False, and
+    strings with a glyph that failed its check are handed back to
+    ImageDraw.text() by draw_text().
+    """
+
+    _PROBE = string.ascii_letters + string.digits + string.punctuation + " °"
+    # A glyph that moves the string it is in moves one of these next to it.
+    _REFERENCES = ("H", "_")
+
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        self.font = font
+        self._ascent, _ = font.getmetrics()
+        # char -> (bitmap or None for blank glyphs, x offset, y offset, advance).
+        # The offsets are from the "la" anchor, i.e. the ascent above the baseline.
+        self._glyphs: dict[str, tuple[Image.Image | None, int, int, int]] = {}
+        # Glyphs whose check against FreeType failed.
+        self._inexact: set[str] = set()
+        self._checking = True
+        self.exact = self._matches_freetype(self._PROBE)
+        self._checking = False
+
+    def glyph(self, char: str) -> tuple[Image.Image | None, int, int, int]:
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = self._glyphs[char] = self._rasterise(char)
+            if not self._checking:
+                self._checking = True
+                if not all(self._matches_freetype(reference + char) for reference in self._REFERENCES):
+                    self._inexact.add(char)
+                self._checking = False
+        return glyph
+
+    def covers(self, text: str) -> bool:
+        """True if draw() renders `text` exactly like ImageDraw.text()."""
+        if not self.exact:
+            return False
+        for char in text:
+            self.glyph(char)
+        return self._inexact.isdisjoint(text)
+
+    def draw(self, draw, xy: tuple[int, int], text: str, fill="white") -> None:
+        x, y = xy
+        for char in text:
+            bitmap, dx, dy, advance = self.glyph(char)
+            if bitmap is not None:
+                draw.bitmap((x + dx, y + dy), bitmap, fill=fill)
+            x += advance
+
+    def _rasterise(self, char: str) -> tuple[Image.Image | None, int, int, int]:
+        # Render on a fixed baseline with generous padding and crop to the
+        # inked pixels: glyphs may reach outside font.getbbox(), so that can't
+        # be used for the crop.
+        pad = self.font.size * 2
+        tile = Image.new("1", (pad * 3, pad * 3))
+        ImageDraw.Draw(tile).text((pad, pad + self._ascent), char, fill=1, font=self.font, anchor="ls")
+        advance = int(self.font.getlength(char))
+        box = tile.getbbox()
+        if box is None:
+            return None, 0, 0, advance
+        return tile.crop(box), box[0] - pad, box[1] - pad, advance
+
+    def _matches_freetype(self, text: str) -> bool:
+        size = (int(self.font.getlength(text)) + self.font.size * 2, self.font.size * 3)
+        expected = Image.new("1", size)
+        ImageDraw.Draw(expected).text((self.font.size, self.font.size), text, fill=1, font=self.font)
+        actual = Image.new("1", size)
+        self.draw(ImageDraw.Draw(actual), (self.font.size, self.font.size), text, fill=1)
+        return expected.tobytes() == actual.tobytes()
+
+
+@lru_cache(maxsize=None)
+def glyph_atlas(font: ImageFont.FreeTypeFont) -> GlyphAtlas:
+    return GlyphAtlas(font)
+
+
+def draw_text(draw, xy: tuple[int, int], text: str, font: ImageFont.FreeTypeFont, fill="white") -> None:
+    """Drop-in for draw.text(xy, text, fill=fill, font=font) that goes through the glyph atlas."""
+    atlas = glyph_atlas(font)
+    if len(text) <= 1 or atlas.covers(text):
+        atlas.draw(draw, xy, text, fill=fill)
+    else:
+        draw.text(xy, text, fill=fill, font=font)
+
+
+def draw_lines(draw, rows: list[tuple[str, ImageFont.FreeTypeFont]], width: int, height: int, spacing: int) -> None:
+    """Draw (text, font) rows as a block centred both ways, `spacing` pixels apart."""
+    bboxes = [text_bbox(text, font) for text, font in rows]
+    heights = [b[3] - b[1] for b in bboxes]
+    widths = [b[2] - b[0] for b in bboxes]
+
+    total_h = sum(heights) + spacing * (len(rows) - 1)
+    y = (height - total_h) // 2
+
+    for (text, font), w, h in zip(rows, widths, heights):
+        draw_text(draw, ((width - w) // 2, y), text, font)
+        y += h + spacing
+
+
 class Screen(ABC):
     # How many seconds this screen stays visible before the loop moves to the next one.
     interval: float = 5.0
     # Whether this screen needs continuous redrawing (e.g. ticking clock).
     live: bool = False
+    # Frames per second while a live screen is shown, see next_frame_at().
+    # Overwritten by config "fps" at runtime.
+    fps: float = 2.0
+    # How many seconds fetched data stays fresh before prefetch() fetches again.
+    # Overwritten by config "ttl" at runtime.
+    ttl: float = 60.0
+    # After a failed fetch, wait `retry_after` seconds before trying again,
+    # doubling with every consecutive failure up to `max_backoff`.
+    retry_after: float = 30.0
+    max_backoff: float = 900.0
+    # Wall-clock time of the last successful fetch (0 = never).
+    fetched_at: float = 0.0
+    # Attributes set by fetch() that are kept across restarts (see snapshot()
+    # and restore()). Their values must be JSON-serialisable.
+    snapshot_fields: tuple[str, ...] = ()
+    # Cache counters, see prefetch().
+    cache_hits: int = 0
+    cache_misses: int = 0
+    fetch_errors: int = 0
+    _fresh_until: float = 0.0
+    _failures: int = 0
+    # Last rendered frame as (fingerprint, size, image); see render().
+    _frame_cache: tuple | None = None
 
     @property
     @abstractmethod
@@ -22,17 +172,121 @@ class Screen(ABC):
         # Short identifier for the screen (e.g. "date", "cpu").
         ...
 
+    def fetch(self) -> float | None:
+        # Override to fetch slow data (e.g. HTTP requests) and store it on the screen.
+        # Raise on failure: the previous data stays on display (stale beats
+        # "N/A") and the next attempt is backed off.
+        # Data shared with other screens may have been fetched earlier; return
+        # that time (time.time()) so `ttl` counts from it. None means now.
+        pass
+
     def prefetch(self) -> None:
-        # Called in a background thread before the screen is displayed.
-        # Override to fetch slow data (e.g. HTTP requests) ahead of time.
+        # Called from the scheduler's worker pool, never from the draw loop.
+        # Calls fetch() only once the data is older than `ttl` (or after the
+        # failure backoff has passed); until then it's a cache hit. Until the
+        # new fetch completes, draw() keeps serving the stale data.
+        now = time.time()
+        if now < self._fresh_until:
+            self.cache_hits += 1
+            return
+
+        self.cache_misses += 1
+        try:
+            fetched_at = self.fetch()
+        except Exception:
+            self.fetch_errors += 1
+            self._failures += 1
+            backoff = self.retry_after * 2 ** (self._failures - 1)
+            self._fresh_until = now + min(backoff, self.max_backoff)
+        else:
+            self._failures = 0
+            self.fetched_at = min(fetched_at or now, now)
+            self._fresh_until = self.fetched_at + self.ttl
+
+    def next_fetch_in(self) -> float:
+        # Seconds until prefetch() would fetch again (0 if it would now).
+        return max(self._fresh_until - time.time(), 0.0)
+
+    def cache_stats(self) -> str:
+        return f"{self.name}: {self.cache_hits} hits, {self.cache_misses} misses, {self.fetch_errors} errors"
+
+    def snapshot_key(self) -> str:
+        # Identifies what the fetched data is about. A snapshot is only restored
+        # into a screen with the same key, so e.g. moving the weather location
+        # in config.json doesn't bring back the old location's forecast.
+        return ""
+
+    def snapshot(self) -> dict | None:
+        # The last fetched data as a JSON-serialisable dict, None if there is
+        # nothing (yet) worth keeping.
+        if not self.snapshot_fields or not self.fetched_at:
+            return None
+        return {
+            "key": self.snapshot_key(),
+            "fetched_at": self.fetched_at,
+            "data": {field: getattr(self, field) for field in self.snapshot_fields},
+        }
+
+    def restore(self, snapshot: dict) -> bool:
+        # Puts data from snapshot() back, as if it had just been fetched at
+        # its original time: still fresh means no fetch until `ttl` runs out,
+        # stale means it is shown until the first refetch lands.
+        if snapshot.get("key") != self.snapshot_key() or set(snapshot["data"]) != set(self.snapshot_fields):
+            return False
+        for field, value in snapshot["data"].items():
+            setattr(self, field, value)
+        self.fetched_at = snapshot["fetched_at"]
+        # Capped at one ttl from now in case the clock was behind when it was
+        # saved (a Pi has no RTC and boots with an old time until NTP syncs).
+        self._fresh_until = min(self.fetched_at, time.time()) + self.ttl
+        return True
+
+    def on_show(self) -> None:
+        # Called by the main loop each time the screen is switched to, before
+        # its first frame. Override to restart anything that should begin
+        # when the screen appears, e.g. paging.
         pass
 
+    def next_frame_at(self, due: float) -> float:
+        # When (time.monotonic()) the frame after the one due at `due` should
+        # be drawn. Only used for live screens. Override to align frames to
+        # something other than a fixed rate, e.g. clock ticks.
+        return due + 1.0 / self.fps
+
+    def fingerprint(self) -> tuple | None:
+        # Everything draw() depends on, e.g. the data stored by fetch().
+        # While it compares equal (==) to the last one, render() reuses the
+        # previous frame instead of laying out and rasterising text again.
+        # None (the default) means "redraw every time" (clocks, live data).
+        return None
+
+    def render(self, size: tuple[int, int], mode: str = "1") -> Image.Image:
+        # Returns the finished frame, drawn fresh or served from the cache.
+        # The returned image is shared with the cache and must not be modified.
+        key = self.fingerprint()
+        cached = self._frame_cache
+        if key is not None and cached is not None and cached[:2] == (key, size):
+            return cached[2]
+
+        image = Image.new(mode, size)
+        self.draw(ImageDraw.Draw(image), *size)
+        if key is not None:
+            self._frame_cache = (key, size, image)
+        return image
+
+    def compose(self, buffer) -> bool:
+        # Optional fast path for the page-buffer backend (main.py --backend
+        # pages): write the frame straight into `buffer`, a pagebuffer.PageBuffer,
+        # and return True. The default returns False and the frame comes from
+        # render() instead.
+        return False
+
     @abstractmethod
     def draw(self, draw, width: int, height: int) -> None:
-        # Called once per display cycle.
+        # Called by render() whenever a new frame is needed.
         #   draw   — a Pillow ImageDraw object (the 128x64 pixel canvas)
         #   width  — display width in pixels  (128)
         #   height — display height in pixels (64)
-        # Everything drawn here gets flushed to the OLED when the
-        # `with canvas(device)` block in main.py exits.
+        # Everything drawn here gets flushed to the OLED through the
+        # FrameDiffer in main.py.
         ...
@@ -1,33 +1,27 @@
-import time
-
-import httpx
-
-from screens.base import Screen, load_font
-
-_FETCH_INTERVAL = 900  # seconds (15 minutes)
-
-
-def _fetch_bf6(username: str, platform: str) -> dict | None:
-    try:
-        url = (
-            "https://api.gametools.network/bf6/stats/"
-            f"?categories=multiplayer&raw=false&format_values=true"
-            f"&seperation=false&name={username}&platform={platform}&skip_battlelog=true"
-        )
-        resp = httpx.get(url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        return {
-            "kills": data["kills"],
-            "deaths": data["deaths"],
-            "kd": data["killDeath"],
-        }
-    except Exception:
-        return None
+from screens import http_client
+from screens.base import Screen, draw_lines, load_font
+
+
+def _fetch_bf6(username: str, platform: str) -> dict:
+    url = (
+        "https://api.gametools.network/bf6/stats/"
+        f"?categories=multiplayer&raw=false&format_values=true"
+        f"&seperation=false&name={username}&platform={platform}&skip_battlelog=true"
+    )
+    resp = http_client.client().get(url)
+    resp.raise_for_status()
+    data = resp.json()
+    return {
+        "kills": data["kills"],
+        "deaths": data["deaths"],
+        "kd": data["killDeath"],
+    }
 
 
 class Bf6Screen(Screen):
     name = "bf6"
+    ttl = 900.0  # 15 minutes
+    snapshot_fields = ("stats",)
 
     def __init__(self, username: str, platform: str = "pc"):
         self.username = username
@@ -36,14 +30,15 @@ class Bf6Screen(Screen):
         self.font = load_font("FreePixel.ttf", 19)
         self.font_sm = load_font("FreePixel.ttf", 16)
         self.stats: dict | None = None
-        self._last_fetch_at: float = 0
 
-    def prefetch(self):
-        if self.stats is not None and (time.time() - self._last_fetch_at) < _FETCH_INTERVAL:
-            return
+    def snapshot_key(self):
+        return f"{self.platform}/{self.username}"
+
+    def fetch(self):
         self.stats = _fetch_bf6(self.username, self.platform)
-        if self.stats is not None:
-            self._last_fetch_at = time.time()
+
+    def fingerprint(self):
+        return (self.stats,)
 
     def draw(self, draw, width, height):
         if not self.stats:
@@ -60,13 +55,4 @@ class Bf6Screen(Screen):
                 ),
             ]
 
-        spacing = 4
-        bboxes = [draw.textbbox((0, 0), text, font=font) for text, font in lines]
-        heights = [b[3] - b[1] for b in bboxes]
-        widths = [b[2] - b[0] for b in bboxes]
-        total_h = sum(heights) + spacing * (len(lines) - 1)
-        y = (height - total_h) // 2
-
-        for i, (text, font) in enumerate(lines):
-            draw.text(((width - widths[i]) // 2, y), text, fill="white", font=font)
-            y += heights[i] + spacing
+        draw_lines(draw, lines, width, height, spacing=4)
@@ -1,35 +1,54 @@
-import psutil
+from screens.base import Screen, draw_lines, draw_text, load_font, text_bbox
+from screens.metrics import SystemSampler
 
-from screens.base import Screen, load_font
+# Sparkline area between the header and the percentile line.
+GRAPH_TOP = 18
+GRAPH_BOTTOM = 50
 
 
 class CpuScreen(Screen):
     name = "cpu"
+    # Redrawn while shown, so the graph scrolls; fingerprint() limits that to
+    # once per new sample.
+    live = True
 
-    def __init__(self):
+    def __init__(self, sampler: SystemSampler | None = None):
         self.font = load_font("FreePixel.ttf", 16)
+        self.font_sm = load_font("FreePixel.ttf", 12)
+        self.sampler = sampler or SystemSampler()
+        self.sampler.start()
+
+    def fingerprint(self):
+        return (self.sampler.samples,)
+
+    def cache_stats(self) -> str:
+        return f"{super().cache_stats()}, sampler {self.sampler.overhead():.3%} CPU"
 
     def draw(self, draw, width, height):
-        label = "CPU"
-        # cpu_percent(interval=None) returns the CPU usage since the last call,
-        # without blocking. On the very first call it returns 0.0 (no previous
-        # sample), but after that it reflects real usage between cycles.
-        pct = f"{psutil.cpu_percent(interval=None):.0f}%"  # e.g. "23%"
-
-        # Measure each line's pixel size (same bbox technique as DateScreen —
-        # see date.py for a detailed explanation of textbbox).
-        label_bbox = draw.textbbox((0, 0), label, font=self.font)
-        pct_bbox = draw.textbbox((0, 0), pct, font=self.font)
-
-        label_w = label_bbox[2] - label_bbox[0]
-        pct_w = pct_bbox[2] - pct_bbox[0]
-        label_h = label_bbox[3] - label_bbox[1]
-        pct_h = pct_bbox[3] - pct_bbox[1]
-
-        # Center both lines vertically and horizontally (same approach as DateScreen).
-        spacing = 4
-        total_h = label_h + spacing + pct_h
-        y_offset = (height - total_h) // 2
-
-        draw.text(((width - label_w) // 2, y_offset), label, fill="white", font=self.font)
-        draw.text(((width - pct_w) // 2, y_offset + label_h + spacing), pct, fill="white", font=self.font)
+        cpu = self.sampler.cpu
+        if not len(cpu):
+            # No sample yet (first PERIOD seconds after start).
+            draw_lines(draw, [("CPU", self.font), ("...", self.font)], width, height, spacing=4)
+            return
+
+        header = f"CPU {cpu.latest():.0f}%"
+        temperature = self.sampler.temperature.latest()
+        if temperature is not None:
+            header += f" {temperature:.0f}°C"
+        bbox = text_bbox(header, self.font)
+        draw_text(draw, ((width - (bbox[2] - bbox[0])) // 2, -bbox[1]), header, self.font)
+
+        # One column per sample, newest on the right, 0-100% over the graph height.
+        span = GRAPH_BOTTOM - GRAPH_TOP
+        values = cpu.values()[-width:]
+        x0 = width - len(values)
+        for i, pct in enumerate(values):
+            bar = round(pct / 100 * span)
+            if bar:
+                draw.line((x0 + i, GRAPH_BOTTOM - bar, x0 + i, GRAPH_BOTTOM - 1), fill="white")
+        draw.line((0, GRAPH_BOTTOM, width - 1, GRAPH_BOTTOM), fill="white")
+
+        footer = f"p50 {cpu.percentile(50):.0f}%  p95 {cpu.percentile(95):.0f}%"
+        bbox = text_bbox(footer, self.font_sm)
+        y = GRAPH_BOTTOM + 2 + (height - GRAPH_BOTTOM - 2 - (bbox[3] - bbox[1])) // 2 - bbox[1]
+        draw_text(draw, ((width - (bbox[2] - bbox[0])) // 2, y), footer, self.font_sm)
@@ -1,6 +1,8 @@
+import math
+import time
 from datetime import datetime
 
-from screens.base import Screen, load_font
+from screens.base import Screen, draw_lines, load_font
 
 
 class DateScreen(Screen):
@@ -10,6 +12,13 @@ class DateScreen(Screen):
     def __init__(self):
         self.font = load_font("FreePixel.ttf", 20)
 
+    def next_frame_at(self, due: float) -> float:
+        # Just after the next wall-clock second (monotonic time has no second
+        # boundaries of its own), so the seconds change exactly on the tick
+        # and there's one frame per change.
+        offset = time.time() - time.monotonic()
+        return math.floor(due + offset) + 1 - offset + 0.005
+
     def draw(self, draw, width, height):
         now = datetime.now()
 
@@ -19,22 +28,4 @@ class DateScreen(Screen):
             now.strftime("%H:%M:%S"),  # "14:30:05"
         ]
 
-        spacing = 6
-
-        # --- Measure all lines ---
-        bboxes = [draw.textbbox((0, 0), line, font=self.font) for line in lines]
-        widths = [b[2] - b[0] for b in bboxes]
-        heights = [b[3] - b[1] for b in bboxes]
-
-        total_h = sum(heights) + spacing * (len(lines) - 1)
-        y = (height - total_h) // 2
-
-        # --- Draw lines ---
-        for line, w, h in zip(lines, widths, heights):
-            draw.text(
-                ((width - w) // 2, y),
-                line,
-                fill="white",
-                font=self.font,
-            )
-            y += h + spacing
+        draw_lines(draw, [(line, self.font) for line in lines], width, height, spacing=6)
@@ -0,0 +1,202 @@
+"""
+Open-Meteo forecast for one location: hourly, 15-minute and daily arrays
+fetched in a single request, and read locally for any moment until the next
+refresh.
+
+Requests go through the shared OPEN_METEO source: screens asking for the
+same location share one answer, and different locations are fetched together
+in one multi-location request.
+
+The forecast is kept as the API returned it (a JSON-serialisable dict with
+`timeformat=unixtime`), so it can be cached and snapshotted as is. "Current"
+values are interpolated between the hourly points around now, so they keep
+moving between refreshes without another request.
+"""
+
+from bisect import bisect_right
+
+from screens import http_client
+from screens.sources import SharedSource
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+HOURLY_FIELDS = ("temperature_2m", "apparent_temperature", "weathercode", "precipitation", "precipitation_probability")
+MINUTELY_FIELDS = ("precipitation",)
+DAILY_FIELDS = ("temperature_2m_max", "temperature_2m_min", "weathercode", "precipitation_sum")
+FORECAST_DAYS = 2
+# 15-minute steps requested: three hours, so "rain in the next hour" stays
+# answerable at that resolution for two hours after a refresh (then hourly).
+MINUTELY_STEPS = 12
+CURRENT_FIELDS = ("temperature_2m", "apparent_temperature", "weathercode")
+# Locations per request. Open-Meteo takes comma-separated coordinates and
+# answers with a list in the same order.
+MAX_LOCATIONS = 50
+
+CONDITIONS = {
+    0: "Clear sky",
+    1: "Mostly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Fog",
+    48: "Rime fog",
+    51: "Light drizzle",
+    53: "Drizzle",
+    55: "Heavy drizzle",
+    56: "Frzg drizzle",
+    57: "Hvy Frzg drizz",
+    61: "Light rain",
+    63: "Rain",
+    65: "Heavy rain",
+    66: "Frzg rain",
+    67: "Hvy Frzg rain",
+    71: "Light snow",
+    73: "Snow",
+    75: "Heavy snow",
+    77: "Snow grains",
+    80: "Light showers",
+    81: "Showers",
+    82: "Heavy showers",
+    85: "Snow showers",
+    86: "Hvy Sno Shwrs",
+    95: "Thunderstorm",
+    96: "T-Storm+Hail",
+    99: "T-Storm+Hail",
+}
+
+
+# Field sets a screen can ask for: query parameters besides the coordinates,
+# and the parts of each answer that are kept.
+_QUERIES = {
+    "forecast": (
+        {
+            "hourly": ",".join(HOURLY_FIELDS),
+            "minutely_15": ",".join(MINUTELY_FIELDS),
+            "daily": ",".join(DAILY_FIELDS),
+            "timeformat": "unixtime",
+            "timezone": "auto",
+            "forecast_days": FORECAST_DAYS,
+            "past_hours": 1,
+            "past_minutely_15": 1,
+            "forecast_minutely_15": MINUTELY_STEPS,
+        },
+        ("utc_offset_seconds", "hourly", "minutely_15", "daily"),
+    ),
+    "current": ({"current": ",".join(CURRENT_FIELDS)}, ("current",)),
+}
+
+
+def _fetch_batch(fields: str, locations: list[tuple[float, float]]) -> list[dict]:
+    params, keep = _QUERIES[fields]
+    params = {
+        **params,
+        "latitude": ",".join(str(lat) for lat, _ in locations),
+        "longitude": ",".join(str(lon) for _, lon in locations),
+    }
+    resp = http_client.client().get(FORECAST_URL, params=params)
+    resp.raise_for_status()
+    data = resp.json()
+    answers = data if isinstance(data, list) else [data]
+    if len(answers) != len(locations):
+        raise ValueError(f"Open-Meteo answered for {len(answers)} of {len(locations)} locations")
+    return [{key: answer[key] for key in keep if key in answer} for answer in answers]
+
+
+OPEN_METEO = SharedSource("open-meteo", _fetch_batch, max_batch=MAX_LOCATIONS)
+
+
+def location(lat: float, lon: float) -> tuple[float, float]:
+    # Source key for a location; ~10 m apart is the same place.
+    return round(lat, 4), round(lon, 4)
+
+
+def fetch_open_meteo(fields: str, lat: float, lon: float, max_age: float = 0.0) -> tuple[float, dict]:
+    """
+    Open-Meteo data for (lat, lon): "forecast" or "current", as (fetched_at,
+    data). Reuses an answer younger than `max_age` seconds fetched for another
+    screen. Raises on network or API errors.
+    """
+    return OPEN_METEO.get(fields, location(lat, lon), max_age)
+
+
+def _slot(times: list[int], now: float) -> int:
+    # Index of the last time <= now (-1 if now is before the first).
+    return bisect_right(times, now) - 1
+
+
+def _interpolate(times: list[int], values: list, now: float) -> float | None:
+    # Linear between the values around now. Missing values (null in the API
+    # answer) are skipped; None if there are none left.
+    points = [(t, value) for t, value in zip(times, values) if value is not None]
+    if not points:
+        return None
+    i = _slot([t for t, _ in points], now)
+    if i < 0:
+        return points[0][1]
+    if i >= len(points) - 1:
+        return points[i][1]
+    (t0, v0), (t1, v1) = points[i], points[i + 1]
+    return v0 + (v1 - v0) * (now - t0) / (t1 - t0)
+
+
+def current(forecast: dict, now: float) -> dict | None:
+    """
+    Same shape as the `current=` API answer: temp and feels_like (°C,
+    rounded), condition. None if the forecast has no temperatures.
+    """
+    hourly = forecast["hourly"]
+    times = hourly["time"]
+    temp = _interpolate(times, hourly["temperature_2m"], now)
+    feels_like = _interpolate(times, hourly["apparent_temperature"], now)
+    if temp is None or feels_like is None:
+        return None
+    code = hourly["weathercode"][max(_slot(times, now), 0)]
+    return {
+        "temp": round(temp),
+        "feels_like": round(feels_like),
+        "condition": CONDITIONS.get(code, "Weather"),
+    }
+
+
+def upcoming(forecast: dict, now: float, hours: int) -> list[tuple[int, float]]:
+    """(time, temperature) for the current hour and the `hours` after it."""
+    hourly = forecast["hourly"]
+    start = max(_slot(hourly["time"], now), 0)
+    end = start + hours + 1
+    return [
+        (t, temperature)
+        for t, temperature in zip(hourly["time"][start:end], hourly["temperature_2m"][start:end])
+        if temperature is not None
+    ]
+
+
+def precipitation(forecast: dict, start: float, end: float) -> tuple[float, float | None]:
+    """
+    Precipitation expected between `start` and `end` (epoch seconds): total mm
+    and when it begins (None if dry). Uses the 15-minute series where it covers
+    the window, otherwise the hourly one. Both are sums over the step *before*
+    their timestamp; steps that only partly overlap are counted pro rata.
+    """
+    for key, step in (("minutely_15", 900), ("hourly", 3600)):
+        series = forecast.get(key)
+        if not series or not series["time"] or series["time"][-1] < end:
+            continue
+        total, begins = 0.0, None
+        for t, mm in zip(series["time"], series["precipitation"]):
+            overlap = min(t, end) - max(t - step, start)
+            if overlap <= 0 or not mm:
+                continue
+            total += mm * overlap / step
+            if begins is None:
+                begins = max(t - step, start)
+        return total, begins
+    return 0.0, None
+
+
+def today(forecast: dict, now: float) -> dict | None:
+    """Today's daily values (min/max temperature, weathercode, precipitation sum)."""
+    daily = forecast.get("daily")
+    if not daily:
+        return None
+    i = _slot(daily["time"], now)
+    if i < 0:
+        return None
+    return {field: daily[field][i] for field in DAILY_FIELDS}
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import importlib.util
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+# httpx itself is imported on the first request, not at startup: it's one of
+# the slowest imports in the app and nothing before the first fetch needs it.
+
+# Defaults for every request made through the shared client (seconds). Calls
+# that need something else (e.g. the slow Ratas API) still pass their own timeout.
+TIMEOUT = 10.0
+CONNECT_TIMEOUT = 5.0
+# Connections are kept alive per host between refreshes, so repeated fetches
+# skip the TCP + TLS handshake (hundreds of ms of CPU on a Pi Zero).
+MAX_CONNECTIONS = 16
+KEEPALIVE_EXPIRY = 300
+
+_settings: dict = {"http2": False, "timeout": TIMEOUT, "max_connections": MAX_CONNECTIONS}
+_client: httpx.Client | None = None
+_lock = threading.Lock()
+
+
+def http2_available() -> bool:
+    # HTTP/2 needs the optional `h2` package (pip install "httpx[http2]").
+    return importlib.util.find_spec("h2") is not None
+
+
+def configure(http2: bool = False, timeout: float | None = None, max_connections: int | None = None) -> None:
+    """Apply the `http` section of config.json. Must run before the first request."""
+    _settings["http2"] = http2 and http2_available()
+    if timeout is not None:
+        _settings["timeout"] = timeout
+    if max_connections is not None:
+        _settings["max_connections"] = max_connections
+
+
+def new_client(**kwargs) -> httpx.Client:
+    """A client with the shared defaults; keyword arguments override them."""
+    import httpx
+
+    timeout = _settings["timeout"]
+    max_connections = _settings["max_connections"]
+    options = {
+        "http2": _settings["http2"],
+        "timeout": httpx.Timeout(timeout, connect=min(timeout, CONNECT_TIMEOUT)),
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max(max_connections // 2, 1),
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    }
+    options.update(kwargs)
+    return httpx.Client(**options)
+
+
+def client() -> httpx.Client:
+    """The process-wide pooled client every screen fetches through."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = new_client()
+    return _client
+
+
+def close() -> None:
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -1,101 +1,47 @@
-import ipaddress
-import re
-import socket
-import subprocess
-from pathlib import Path
-
-from screens.base import Screen, load_font
-
-
-def _get_local_subnet() -> str | None:
-    """Detect the local /24 subnet CIDR (e.g. '192.168.1.0/24')."""
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-        network = ipaddress.IPv4Network(f"{local_ip}/24", strict=False)
-        return str(network)
-    except Exception:
-        return None
-
-
-def _count_via_nmap(subnet: str) -> int | None:
-    """Active host scan with nmap. Returns host count or None if unavailable."""
-    try:
-        result = subprocess.run(
-            ["nmap", "-sn", "--min-parallelism", "100", subnet],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        if result.returncode != 0:
-            return None
-        # "Nmap done: 256 IP addresses (5 hosts up) scanned in 2.34 seconds"
-        match = re.search(r"(\d+) hosts? up", result.stdout)
-        return int(match.group(1)) if match else None
-    except Exception:
-        return None
-
-
-def _count_via_arp() -> int | None:
-    """Count recently-seen devices from the kernel ARP table."""
-    try:
-        arp_path = Path("/proc/net/arp")
-        if not arp_path.exists():
-            return None
-        lines = arp_path.read_text().splitlines()[1:]  # skip header
-        return sum(
-            1
-            for line in lines
-            if (p := line.split())
-            and len(p) >= 4
-            and p[2] != "0x0"
-            and p[3] != "00:00:00:00:00:00"
-        )
-    except Exception:
-        return None
-
-
-def _count_lan_devices() -> int | None:
-    subnet = _get_local_subnet()
-    if subnet:
-        count = _count_via_nmap(subnet)
-        if count is not None:
-            return count
-    return _count_via_arp()
+from screens.base import Screen, draw_lines, load_font
+from screens.lan_devices import LanDiscovery
 
 
 class LanScreen(Screen):
     name = "lan"
+    # Between sweeps a refresh only reads the kernel ARP table, so it's cheap.
+    ttl = 30.0
+    snapshot_fields = ("count",)
 
-    def __init__(self):
+    def __init__(self, sweep_interval: float | None = None, expiry: float | None = None, watch: bool = True):
         self.font = load_font("FreePixel.ttf", 20)
+        options = {"sweep_interval": sweep_interval, "expiry": expiry}
+        self.discovery = LanDiscovery(**{k: v for k, v in options.items() if v is not None})
+        # Follow neighbour-table changes over netlink instead of re-reading
+        # /proc/net/arp; started on the first fetch, falls back if unavailable.
+        self.watch = watch
         self.count: int | None = None
 
-    def prefetch(self):
-        self.count = _count_lan_devices()
+    def fetch(self):
+        if self.watch and self.discovery.watcher is None:
+            self.discovery.watch()
+        count = self.discovery.update()
+        if self.discovery.subnet is None and not count:
+            raise RuntimeError("no local network found")
+        self.count = count
+
+    def _current(self) -> int | None:
+        # The count to show. With the watcher running, changes since the last
+        # fetch are already in the table; `count` itself is only set by fetch().
+        if self.count is not None and self.discovery.watcher is not None:
+            return self.discovery.count()
+        return self.count
+
+    def fingerprint(self):
+        return (self._current(),)
 
     def draw(self, draw, width, height):
-        if self.count is None:
+        count = self._current()
+        if count is None:
             lines = ["LAN", "N/A"]
-        elif self.count == 1:
+        elif count == 1:
             lines = ["LAN", "1 device"]
         else:
-            lines = ["LAN", f"{self.count} devices"]
-
-        spacing = 4
-        bboxes = [draw.textbbox((0, 0), line, font=self.font) for line in lines]
-        heights = [b[3] - b[1] for b in bboxes]
-        widths = [b[2] - b[0] for b in bboxes]
-
-        total_h = sum(heights) + spacing * (len(lines) - 1)
-        y = (height - total_h) // 2
+            lines = ["LAN", f"{count} devices"]
 
-        for i, line in enumerate(lines):
-            draw.text(
-                ((width - widths[i]) // 2, y),
-                line,
-                fill="white",
-                font=self.font,
-            )
-            y += heights[i] + spacing
+        draw_lines(draw, [(line, self.font) for line in lines], width, height, spacing=4)
@@ -0,0 +1,353 @@
+"""
+In-process LAN discovery: a device table fed by the kernel ARP table and by
+periodic TCP-connect sweeps of the local subnet.
+
+Between sweeps the table is updated from /proc/net/arp only, which is a file
+read. A sweep tries a few common TCP ports on every address of the subnet at
+once (asyncio, bounded concurrency). Any answer, including a refused
+connection, proves the host is up. Hosts that drop everything still get
+resolved by the kernel while being probed, so the ARP read that follows the
+sweep picks them up too. Raw ARP/ICMP would need root, this doesn't.
+
+Where rtnetlink is available, NeighbourWatcher replaces the ARP file reads:
+it subscribes to the kernel's neighbour-table changes and keeps the current
+entries in memory, so nothing is polled or parsed between sweeps.
+"""
+
+import asyncio
+import errno
+import ipaddress
+import socket
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ARP_PATH = Path("/proc/net/arp")
+# Ports tried on every address during a sweep: web, ssh, SMB, DNS, Apple sync.
+PROBE_PORTS = (80, 443, 22, 445, 53, 62078)
+PROBE_TIMEOUT = 1.0
+# Sockets a sweep may hold open at once: a quarter of the default 1024
+# open-file limit, leaving the rest for everything else the process has open
+# (netlink, the HTTP pool, GPIO, snapshot files).
+MAX_OPEN_SOCKETS = 256
+# Hosts probed at once. tcp_probe() opens one socket per port in parallel,
+# so this is the socket budget divided by the ports.
+MAX_CONCURRENT_PROBES = MAX_OPEN_SOCKETS // len(PROBE_PORTS)
+# Seconds between full sweeps, and since last seen before a device is dropped.
+SWEEP_INTERVAL = 300.0
+DEVICE_EXPIRY = 900.0
+
+Prober = Callable[[str], Awaitable[bool]]
+
+# rtnetlink constants (linux/rtnetlink.h, linux/neighbour.h).
+RTMGRP_NEIGH = 0x4
+RTM_NEWNEIGH, RTM_DELNEIGH, RTM_GETNEIGH = 28, 29, 30
+NLMSG_ERROR, NLMSG_DONE = 2, 3
+NLM_F_REQUEST, NLM_F_DUMP = 0x1, 0x300
+NDA_DST, NDA_LLADDR = 1, 2
+# NUD_REACHABLE | NUD_STALE | NUD_DELAY | NUD_PROBE | NUD_PERMANENT: the
+# states /proc/net/arp shows as complete (flags 0x2).
+NUD_RESOLVED = 0x02 | 0x04 | 0x08 | 0x10 | 0x80
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_NDMSG = struct.Struct("=BBHiHBB")
+_RTATTR = struct.Struct("=HH")
+
+
+def get_local_address() -> str | None:
+    """IPv4 address of the interface that routes to the internet (no packets sent)."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return None
+
+
+def parse_arp(text: str) -> dict[str, str]:
+    """Resolved entries of /proc/net/arp content as {ip: mac}."""
+    # Every row has the same six whitespace-free columns, so one split() over
+    # the whole file and strided slices beat splitting it line by line.
+    fields = text.split()
+    if len(fields) % 6 == 3:  # header "IP address HW type Flags HW address Mask Device"
+        ips, flags, macs = fields[9::6], fields[11::6], fields[12::6]
+        return {
+            ip: mac
+            for ip, flag, mac in zip(ips, flags, macs)
+            if flag != "0x0" and mac != "00:00:00:00:00:00"
+        }
+
+    table = {}
+    for line in text.splitlines()[1:]:
+        p = line.split()
+        if len(p) >= 4 and p[2] != "0x0" and p[3] != "00:00:00:00:00:00":
+            table[p[0]] = p[3]
+    return table
+
+
+def read_arp_table(path: Path = ARP_PATH) -> dict[str, str]:
+    """Resolved entries of the kernel ARP table as {ip: mac}; empty if unreadable."""
+    try:
+        return parse_arp(path.read_text())
+    except OSError:
+        return {}
+
+
+def parse_neighbour_messages(data: bytes) -> list[tuple[int, str, str | None, int]]:
+    """IPv4 neighbour messages in one netlink datagram as (type, ip, mac, NUD state)."""
+    messages = []
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, _, _, _ = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size:
+            break
+        end = offset + length
+        if msg_type in (RTM_NEWNEIGH, RTM_DELNEIGH):
+            family, _, _, _, state, _, _ = _NDMSG.unpack_from(data, offset + _NLMSGHDR.size)
+            ip = mac = None
+            attr = offset + _NLMSGHDR.size + _NDMSG.size
+            while attr + _RTATTR.size <= end:
+                attr_len, attr_type = _RTATTR.unpack_from(data, attr)
+                if attr_len < _RTATTR.size:
+                    break
+                value = data[attr + _RTATTR.size:attr + attr_len]
+                if attr_type == NDA_DST and family == socket.AF_INET:
+                    ip = socket.inet_ntoa(value)
+                elif attr_type == NDA_LLADDR:
+                    mac = value.hex(":")
+                attr += (attr_len + 3) & ~3
+            if ip is not None:
+                messages.append((msg_type, ip, mac, state))
+        elif msg_type in (NLMSG_DONE, NLMSG_ERROR):
+            messages.append((msg_type, "", None, 0))
+        offset += (length + 3) & ~3
+    return messages
+
+
+class NeighbourWatcher:
+    """
+    Live copy of the kernel's resolved IPv4 neighbours, kept current by
+    rtnetlink notifications on a daemon thread.
+
+    Raises OSError on construction where netlink isn't available (not Linux,
+    sandboxed); callers fall back to read_arp_table().
+    """
+
+    def __init__(self, on_change: Callable[[str, str | None], None] | None = None):
+        self.on_change = on_change
+        self._neighbours: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        try:
+            self._sock.bind((0, RTMGRP_NEIGH))
+            self._dump()
+        except OSError:
+            self._sock.close()
+            raise
+        threading.Thread(target=self._run, name="neighbours", daemon=True).start()
+
+    def snapshot(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._neighbours)
+
+    def _request_dump(self):
+        self._seq += 1
+        ndmsg = _NDMSG.pack(socket.AF_INET, 0, 0, 0, 0, 0, 0)
+        header = _NLMSGHDR.pack(_NLMSGHDR.size + len(ndmsg), RTM_GETNEIGH, NLM_F_REQUEST | NLM_F_DUMP, self._seq, 0)
+        self._sock.send(header + ndmsg)
+
+    def _dump(self):
+        # Full table, read synchronously; notifications that arrive meanwhile are applied too.
+        self._request_dump()
+        with self._lock:
+            self._neighbours.clear()
+        while not self._handle(self._sock.recv(65536)):
+            pass
+
+    def _run(self):
+        while True:
+            try:
+                self._handle(self._sock.recv(65536))
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    return
+                # Notifications were dropped (receive buffer overflow): resync.
+                try:
+                    self._dump()
+                except OSError:
+                    return
+
+    def _handle(self, data: bytes) -> bool:
+        # Applies one datagram; True once it contained the end of a dump.
+        done = False
+        for msg_type, ip, mac, state in parse_neighbour_messages(data):
+            if msg_type in (NLMSG_DONE, NLMSG_ERROR):
+                done = True
+                continue
+            resolved = (
+                msg_type == RTM_NEWNEIGH
+                and state & NUD_RESOLVED
+                and mac is not None
+                and mac != "00:00:00:00:00:00"
+            )
+            with self._lock:
+                if resolved:
+                    changed = self._neighbours.get(ip) != mac
+                    self._neighbours[ip] = mac
+                else:
+                    changed = self._neighbours.pop(ip, None) is not None
+            if changed and self.on_change is not None:
+                self.on_change(ip, mac if resolved else None)
+        return done
+
+
+async def tcp_probe(ip: str, ports=PROBE_PORTS, timeout: float = PROBE_TIMEOUT) -> bool:
+    """True if `ip` accepts or refuses a TCP connection on any of `ports`."""
+
+    async def knock(port: int) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except ConnectionRefusedError:
+            return True  # RST: something is there
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+    return any(await asyncio.gather(*(knock(port) for port in ports)))
+
+
+class DeviceTable:
+    """IP -> (MAC or None, last-seen time). Entries not seen for `expiry` seconds are dropped."""
+
+    def __init__(self, expiry: float = DEVICE_EXPIRY):
+        self.expiry = expiry
+        self._devices: dict[str, tuple[str | None, float]] = {}
+        self._lock = threading.Lock()
+
+    def see(self, ip: str, mac: str | None, now: float) -> None:
+        with self._lock:
+            old = self._devices.get(ip)
+            self._devices[ip] = (mac or (old[0] if old else None), now)
+
+    def expire(self, now: float) -> None:
+        with self._lock:
+            self._devices = {
+                ip: entry for ip, entry in self._devices.items() if now - entry[1] < self.expiry
+            }
+
+    def devices(self) -> dict[str, tuple[str | None, float]]:
+        with self._lock:
+            return dict(self._devices)
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+
+class LanDiscovery:
+    """
+    Keeps a DeviceTable of the local /24 up to date.
+
+    `update()` merges the ARP table, runs a sweep if the last one is older than
+    `sweep_interval`, expires old entries and returns the device count. After
+    `watch()`, neighbour changes land in the table as they happen and
+    `count()` is current without any update(). The prober, ARP reader and
+    clock can be swapped out for testing.
+    """
+
+    def __init__(
+        self,
+        subnet: str | None = None,
+        local_ip: str | None = None,
+        prober: Prober = tcp_probe,
+        arp_reader: Callable[[], dict[str, str]] = read_arp_table,
+        sweep_interval: float = SWEEP_INTERVAL,
+        expiry: float = DEVICE_EXPIRY,
+        max_concurrent: int = MAX_CONCURRENT_PROBES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.subnet = subnet
+        self.local_ip = local_ip
+        self.prober = prober
+        self.arp_reader = arp_reader
+        self.sweep_interval = sweep_interval
+        self.max_concurrent = max_concurrent
+        self.clock = clock
+        self.table = DeviceTable(expiry)
+        self.last_sweep: float = 0.0
+        self.watcher: NeighbourWatcher | None = None
+        # Guards subnet/local_ip: the watcher thread's _on_neighbour() may
+        # look them up while a fetch does.
+        self._lock = threading.Lock()
+
+    def _network(self) -> ipaddress.IPv4Network | None:
+        with self._lock:
+            if self.subnet is None:
+                self.local_ip = self.local_ip or get_local_address()
+                if self.local_ip is None:
+                    return None
+                self.subnet = str(ipaddress.IPv4Network(f"{self.local_ip}/24", strict=False))
+            return ipaddress.IPv4Network(self.subnet)
+
+    def watch(self) -> bool:
+        """Switch from reading /proc/net/arp to netlink notifications. False if unavailable."""
+        if self.watcher is None:
+            try:
+                self.watcher = NeighbourWatcher(on_change=self._on_neighbour)
+            except OSError:
+                return False
+            self.arp_reader = self.watcher.snapshot
+        return True
+
+    def _on_neighbour(self, ip: str, mac: str | None):
+        network = self._network()
+        if mac is not None and (network is None or ipaddress.IPv4Address(ip) in network):
+            self.table.see(ip, mac, self.clock())
+
+    def count(self) -> int:
+        self.table.expire(self.clock())
+        return len(self.table)
+
+    def merge_arp(self) -> None:
+        network = self._network()
+        now = self.clock()
+        for ip, mac in self.arp_reader().items():
+            if network is None or ipaddress.IPv4Address(ip) in network:
+                self.table.see(ip, mac, now)
+        if self.local_ip is not None:
+            self.table.see(self.local_ip, None, now)
+
+    def sweep(self) -> None:
+        """Probe every host address of the subnet (blocking), then re-read the ARP table."""
+        network = self._network()
+        if network is None:
+            return
+        hosts = [str(ip) for ip in network.hosts() if str(ip) != self.local_ip]
+        alive = asyncio.run(self._probe_all(hosts))
+        now = self.clock()
+        for ip in alive:
+            self.table.see(ip, None, now)
+        self.last_sweep = now
+        self.merge_arp()
+
+    async def _probe_all(self, hosts: list[str]) -> list[str]:
+        limit = asyncio.Semaphore(self.max_concurrent)
+
+        async def probe(ip: str) -> bool:
+            async with limit:
+                try:
+                    return await self.prober(ip)
+                except Exception:
+                    return False
+
+        results = await asyncio.gather(*(probe(ip) for ip in hosts))
+        return [ip for ip, up in zip(hosts, results) if up]
+
+    def update(self) -> int:
+        self.merge_arp()
+        if self.clock() - self.last_sweep >= self.sweep_interval:
+            self.sweep()
+        return self.count()
@@ -1,6 +1,9 @@
 import random
+import time
 
-from screens.base import Screen, load_font
+from PIL import Image, ImageDraw
+
+from screens.base import Screen, draw_text, glyph_atlas, load_font, text_bbox
 
 ASCII_LINES = [
     "        _,--',   _._.--._____ ",
@@ -25,38 +28,120 @@ class MapScreen(Screen):
     name = "map"
     live = True
     interval = 10.0  # fallback; overwritten by config "duration" at runtime
+    fps = 10.0  # upper bound; frames are only drawn when a cell blinks
+    # One random blink cell toggles every `blink_period` seconds, however many
+    # frames are drawn in between (0 = one toggle per frame).
+    blink_period = 0.5
 
-    def __init__(self):
+    def __init__(self, prerender: bool = True):
+        # prerender=True rasterises the static part of the map once and only
+        # composites the blink cells per frame; False draws every character
+        # each frame (the original renderer, kept for comparison).
+        self.prerender = prerender
         self.font = load_font("IBMPlexMono-Regular.ttf", 6)
         self._blink: dict[tuple[int, int], bool] = {
             coord: random.random() > 0.5 for coord in BLINK_COORDINATES
         }
         self._blink_set = set(BLINK_COORDINATES)
+        self._next_blink: float | None = None
         self._char_w: int | None = None
         self._char_h: int | None = None
+        # (width, height) -> (map without blink cells, {coord: (glyph, xy)})
+        self._layers: dict[tuple[int, int], tuple[Image.Image, dict]] = {}
+        # Same layers packed into SH1106 pages, for compose().
+        self._packed: dict[tuple[int, int], tuple] = {}
 
-    def _char_dims(self, draw):
+    def _char_dims(self):
         if self._char_w is None:
-            bbox = draw.textbbox((0, 0), "X", font=self.font)
+            bbox = text_bbox("X", self.font)
             self._char_w = bbox[2] - bbox[0]
             ascent, descent = self.font.getmetrics()
             self._char_h = ascent + descent
         return self._char_w, self._char_h
 
-    def draw(self, draw, width: int, height: int) -> None:
-        char_w, char_h = self._char_dims(draw)
-
-        # Toggle one random blink coordinate each frame (called every 0.5s)
-        coord = random.choice(BLINK_COORDINATES)
-        self._blink[coord] = not self._blink[coord]
-
+    def _cells(self, height: int):
+        # Yields (row, col, char, x, y) for every character of the map.
+        char_w, char_h = self._char_dims()
         total_h = char_h * len(ASCII_LINES)
         y_start = (height - total_h) // 2
 
         for row, line in enumerate(ASCII_LINES):
             y = y_start + row * char_h
             for col, char in enumerate(line):
+                yield row, col, char, col * char_w, y
+
+    def _prerendered(self, width: int, height: int):
+        layers = self._layers.get((width, height))
+        if layers is None:
+            base = Image.new("1", (width, height))
+            base_draw = ImageDraw.Draw(base)
+            atlas = glyph_atlas(self.font)
+            tiles = {}
+            for row, col, char, x, y in self._cells(height):
+                if (row, col) in self._blink_set:
+                    glyph, dx, dy, _ = atlas.glyph(char)
+                    tiles[(row, col)] = (glyph, (x + dx, y + dy))
+                else:
+                    draw_text(base_draw, (x, y), char, self.font, fill=1)
+            layers = self._layers[(width, height)] = (base, tiles)
+        return layers
+
+    def _toggle_blink(self):
+        # Called once per frame; toggles as many cells as blink periods have passed.
+        if self.blink_period <= 0:
+            steps = 1
+        else:
+            now = time.monotonic()
+            if self._next_blink is None or now - self._next_blink > 10 * self.blink_period:
+                self._next_blink = now  # first frame, or the screen was off for a while
+            steps = 0
+            while self._next_blink <= now:
+                steps += 1
+                self._next_blink += self.blink_period
+        for _ in range(steps):
+            coord = random.choice(BLINK_COORDINATES)
+            self._blink[coord] = not self._blink[coord]
+
+    def next_frame_at(self, due: float) -> float:
+        # The map only changes when a cell blinks: wake just after the next
+        # blink, but never more often than `fps`.
+        earliest = due + 1.0 / self.fps
+        if self.blink_period <= 0 or self._next_blink is None:
+            return earliest
+        return max(earliest, self._next_blink + 0.005)
+
+    def compose(self, buffer) -> bool:
+        from pagebuffer import pack
+
+        self._toggle_blink()
+        size = (buffer.width, buffer.height)
+        packed = self._packed.get(size)
+        if packed is None:
+            base, tiles = self._prerendered(*size)
+            packed = self._packed[size] = (
+                pack(base),
+                {rc: (pack(glyph), xy) for rc, (glyph, xy) in tiles.items() if glyph is not None},
+            )
+        base, tiles = packed
+        buffer.load(base)
+        for rc, (glyph, (x, y)) in tiles.items():
+            if self._blink[rc]:
+                buffer.blit(glyph, x, y)
+        return True
+
+    def draw(self, draw, width: int, height: int) -> None:
+        self._toggle_blink()
+
+        if not self.prerender:
+            for row, col, char, x, y in self._cells(height):
                 rc = (row, col)
                 if rc in self._blink_set and not self._blink[rc]:
                     continue  # invisible (blink off)
-                draw.text((col * char_w, y), char, fill="white", font=self.font)
+                draw_text(draw, (x, y), char, self.font)
+            return
+
+        base, tiles = self._prerendered(width, height)
+        draw.bitmap((0, 0), base, fill="white")
+        for rc, (glyph, xy) in tiles.items():
+            if glyph is not None and self._blink[rc]:
+                draw.bitmap(xy, glyph, fill="white")
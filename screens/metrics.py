@@ -0,0 +1,143 @@
+"""
+Background system sampler: CPU (total and per core), load, memory,
+temperature and disk I/O recorded at a fixed rate into fixed-size ring
+buffers, so memory use doesn't grow with uptime.
+"""
+
+import math
+import os
+import threading
+import time
+from array import array
+from pathlib import Path
+
+THERMAL_PATH = Path("/sys/class/thermal/thermal_zone0/temp")
+# One sample every PERIOD seconds, HISTORY samples kept: one per pixel column
+# of the 128 px display, about four minutes.
+PERIOD = 2.0
+HISTORY = 128
+
+
+class RingBuffer:
+    """Last `capacity` values in a preallocated array (typecode "d": C doubles)."""
+
+    def __init__(self, capacity: int, typecode: str = "d"):
+        self.capacity = capacity
+        self._data = array(typecode, bytes(array(typecode).itemsize * capacity))
+        self._next = 0
+        self._len = 0
+
+    def append(self, value: float) -> None:
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._len = min(self._len + 1, self.capacity)
+
+    def values(self) -> list[float]:
+        """Oldest first."""
+        if self._len < self.capacity:
+            return self._data[: self._len].tolist()
+        return (self._data[self._next :] + self._data[: self._next]).tolist()
+
+    def latest(self) -> float | None:
+        return self._data[self._next - 1] if self._len else None
+
+    def percentile(self, p: float) -> float | None:
+        """Nearest-rank percentile (0-100) of the buffered values."""
+        if not self._len:
+            return None
+        ordered = sorted(self._data[: self._len])
+        return ordered[max(math.ceil(p / 100 * self._len) - 1, 0)]
+
+    def __len__(self) -> int:
+        return self._len
+
+
+def _read_temperature() -> float | None:
+    # The SoC sensor on a Pi; cheaper than psutil.sensors_temperatures(),
+    # which walks every hwmon device.
+    try:
+        return int(THERMAL_PATH.read_text()) / 1000
+    except (OSError, ValueError):
+        return None
+
+
+def _disk_bytes(psutil) -> int | None:
+    counters = psutil.disk_io_counters()
+    return counters.read_bytes + counters.write_bytes if counters else None
+
+
+class SystemSampler:
+    """
+    Samples system metrics every `period` seconds on a daemon thread.
+
+    Buffers: `cpu` (percent, all cores), `cores` (one per core), `load` (1 min
+    load average), `memory` (percent used), `temperature` (°C, stays empty
+    without a sensor) and `disk_io` (bytes/s read + written). `samples`
+    counts samples taken, `overhead()` is the CPU time spent sampling as a
+    fraction of wall time.
+    """
+
+    def __init__(self, period: float = PERIOD, history: int = HISTORY):
+        # Imported here so that importing this module (e.g. for RingBuffer)
+        # doesn't load psutil.
+        import psutil
+
+        self._psutil = psutil
+        self.period = period
+        self.cpu = RingBuffer(history)
+        self.cores = [RingBuffer(history) for _ in range(psutil.cpu_count() or 1)]
+        self.load = RingBuffer(history)
+        self.memory = RingBuffer(history)
+        self.temperature = RingBuffer(history)
+        self.disk_io = RingBuffer(history)
+        self.samples = 0
+        self._busy = 0.0
+        self._started = 0.0
+        self._last_disk: tuple[float, int] | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        # cpu_percent(interval=None) measures since the previous call; prime it
+        # so the first real sample covers one period instead of returning 0.0.
+        self._psutil.cpu_percent(interval=None, percpu=True)
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.period):
+            self.sample()
+
+    def sample(self) -> None:
+        start = time.thread_time()
+        psutil = self._psutil
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        for buffer, pct in zip(self.cores, per_core):
+            buffer.append(pct)
+        self.cpu.append(sum(per_core) / len(per_core))
+        self.load.append(os.getloadavg()[0])
+        self.memory.append(psutil.virtual_memory().percent)
+
+        temperature = _read_temperature()
+        if temperature is not None:
+            self.temperature.append(temperature)
+
+        now, disk = time.monotonic(), _disk_bytes(psutil)
+        if disk is not None:
+            if self._last_disk is not None:
+                elapsed = now - self._last_disk[0]
+                self.disk_io.append((disk - self._last_disk[1]) / elapsed if elapsed > 0 else 0.0)
+            self._last_disk = (now, disk)
+
+        self.samples += 1
+        self._busy += time.thread_time() - start
+
+    def overhead(self) -> float:
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return self._busy / elapsed if elapsed > 0 else 0.0
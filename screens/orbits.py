@@ -0,0 +1,83 @@
+"""
+Local satellite visibility from TLEs: vectorised SGP4 propagation and a
+topocentric elevation test, so counting what is overhead needs no network.
+
+Needs the optional `sgp4` and `numpy` packages, the `tle` extra
+(pip install ".[tle]" or uv sync --extra tle).
+"""
+
+import math
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+    from sgp4.api import SatrecArray, Satrec, jday
+except ImportError as e:
+    raise ImportError(
+        'the "tle" satellites engine needs sgp4 and numpy: pip install ".[tle]" (or uv sync --extra tle)'
+    ) from e
+
+# WGS84 ellipsoid, km.
+_WGS84_A = 6378.137
+_WGS84_F = 1 / 298.257223563
+_WGS84_E2 = _WGS84_F * (2 - _WGS84_F)
+
+
+def parse_tles(text: str) -> SatrecArray | None:
+    """Parse 2- or 3-line TLE text (CelesTrak FORMAT=tle) into one SatrecArray."""
+    lines = [line.rstrip() for line in text.splitlines() if line.strip()]
+    sats = [
+        Satrec.twoline2rv(line, lines[i + 1])
+        for i, line in enumerate(lines[:-1])
+        if line.startswith("1 ") and lines[i + 1].startswith("2 ")
+    ]
+    return SatrecArray(sats) if sats else None
+
+
+def _gmst(jd_ut1: float) -> float:
+    # Greenwich mean sidereal time (IAU 1982), radians.
+    t = (jd_ut1 - 2451545.0) / 36525.0
+    seconds = 67310.54841 + (876600.0 * 3600 + 8640184.812866) * t + 0.093104 * t**2 - 6.2e-6 * t**3
+    return math.radians((seconds % 86400.0) / 240.0)
+
+
+def _observer(lat: float, lon: float, alt_km: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    # Observer position (ECEF, km) and local "up" unit vector.
+    phi, lam = math.radians(lat), math.radians(lon)
+    n = _WGS84_A / math.sqrt(1 - _WGS84_E2 * math.sin(phi) ** 2)
+    position = np.array([
+        (n + alt_km) * math.cos(phi) * math.cos(lam),
+        (n + alt_km) * math.cos(phi) * math.sin(lam),
+        (n * (1 - _WGS84_E2) + alt_km) * math.sin(phi),
+    ])
+    up = np.array([math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)])
+    return position, up
+
+
+def elevations(sats: SatrecArray, lat: float, lon: float, when: datetime | None = None) -> np.ndarray:
+    """Elevation in degrees of every satellite as seen from (lat, lon); NaN where SGP4 failed."""
+    when = when or datetime.now(timezone.utc)
+    jd, fr = jday(when.year, when.month, when.day, when.hour, when.minute,
+                  when.second + when.microsecond / 1e6)
+    errors, r, _ = sats.sgp4(np.array([jd]), np.array([fr]))
+    teme = r[:, 0, :]
+
+    # TEME -> Earth-fixed: rotate about z by GMST (polar motion ignored; it's
+    # metres, far below what matters for an elevation cut-off).
+    g = _gmst(jd + fr)
+    cos_g, sin_g = math.cos(g), math.sin(g)
+    ecef = np.empty_like(teme)
+    ecef[:, 0] = cos_g * teme[:, 0] + sin_g * teme[:, 1]
+    ecef[:, 1] = -sin_g * teme[:, 0] + cos_g * teme[:, 1]
+    ecef[:, 2] = teme[:, 2]
+
+    position, up = _observer(lat, lon)
+    rho = ecef - position
+    sin_el = rho @ up / np.linalg.norm(rho, axis=1)
+    result = np.degrees(np.arcsin(np.clip(sin_el, -1.0, 1.0)))
+    result[errors[:, 0] != 0] = np.nan
+    return result
+
+
+def count_above(sats: SatrecArray, lat: float, lon: float, min_elevation: float, when: datetime | None = None) -> int:
+    return int(np.count_nonzero(elevations(sats, lat, lon, when) >= min_elevation))
@@ -1,16 +1,83 @@
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import httpx
-from dotenv import dotenv_values
+from screens import http_client
+from screens.base import Screen, draw_lines, load_font
+from screens.sources import SharedSource
 
-from screens.base import Screen, load_font
-
-_FETCH_INTERVAL = 900  # seconds (15 minutes)
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 _ENV_PATH = _PROJECT_ROOT / ".env"
 
 _N2YO_BASE = "https://api.n2yo.com/rest/v1/satellite/above/{lat}/{lon}/0/{radius}/{cat}/&apiKey={key}"
+_CELESTRAK_URL = "https://celestrak.org/NORAD/elements/gp.php?{query}&FORMAT=tle"
+_TLE_CACHE_DIR = _PROJECT_ROOT / ".tle_cache"
+
+# Display name -> N2YO category id. "ISS" is shown as "ISS above!" only when
+# it is overhead; every other category as "<count> <name>".
+DEFAULT_CATEGORIES = {"ISS": 2, "Galileo": 22, "Starlink": 52}
+# Display name -> CelesTrak GP query, for the local "tle" engine.
+DEFAULT_TLE_SOURCES = {"ISS": "CATNR=25544", "Galileo": "GROUP=galileo", "Starlink": "GROUP=starlink"}
+# N2YO free tier: 100 "above" requests per API key per hour (the 1,000/hour
+# limit is for the tle and positions endpoints). Configurable per screen with
+# `hourly_limit` for keys with a different quota.
+N2YO_HOURLY_LIMIT = 100
+# TLEs are downloaded at most this often (seconds); CelesTrak updates them a
+# few times a day and propagation stays accurate enough for days.
+TLE_MAX_AGE = 24 * 3600
+# After a failed download the old file is used for this long (seconds) before
+# CelesTrak is asked again.
+TLE_RETRY_AFTER = 3600
+
+# Source name -> time.monotonic() before which a stale file isn't redownloaded.
+_TLE_RETRY_AT: dict[str, float] = {}
+
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="n2yo")
+
+
+class RequestBudget:
+    """Requests made with one API key over the last hour (sliding window)."""
+
+    def __init__(self, limit: int, window: float = 3600.0):
+        self.limit = limit
+        self.window = window
+        self._sent: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float):
+        while self._sent and now - self._sent[0] >= self.window:
+            self._sent.popleft()
+
+    def remaining(self) -> int:
+        with self._lock:
+            self._prune(time.monotonic())
+            return self.limit - len(self._sent)
+
+    def acquire(self, n: int = 1) -> bool:
+        # Reserves n requests if they fit in the window; False otherwise.
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            if len(self._sent) + n > self.limit:
+                return False
+            self._sent.extend([now] * n)
+            return True
+
+
+# Shared by every screen using the same key, since N2YO counts per key.
+_BUDGETS: dict[str, RequestBudget] = {}
+_BUDGETS_LOCK = threading.Lock()
+
+
+def budget_for(api_key: str, limit: int | None = None) -> RequestBudget:
+    # Screens sharing a key may configure different limits; the lowest wins.
+    with _BUDGETS_LOCK:
+        budget = _BUDGETS.setdefault(api_key, RequestBudget(limit or N2YO_HOURLY_LIMIT))
+        if limit is not None and limit < budget.limit:
+            budget.limit = limit
+        return budget
 
 
 def _fetch_count(
@@ -19,64 +86,148 @@ def _fetch_count(
     url = _N2YO_BASE.format(
         lat=lat, lon=lon, radius=search_radius, cat=category, key=api_key
     )
+    resp = http_client.client().get(url)
+    resp.raise_for_status()
+    return resp.json().get("info", {}).get("satcount", 0)
+
+
+def _fetch_counts(group: tuple[int, int, str], items: list[tuple[float, float]]) -> list[int]:
+    category, search_radius, api_key = group
+    # Charged per request actually sent; answers shared from the cache are free.
+    if not budget_for(api_key).acquire(len(items)):
+        raise RuntimeError("N2YO hourly request budget used up")
+    return [_fetch_count(lat, lon, category, api_key, search_radius) for lat, lon in items]
+
+
+# Group (category, search radius, API key), item (lat, lon). One category and
+# location per N2YO request: deduplicated, not batched.
+_N2YO = SharedSource("n2yo", _fetch_counts)
+
+
+def _load_tles(name: str, query: str) -> tuple[float, str]:
+    """TLE text for one source from the on-disk cache, downloading it if older than TLE_MAX_AGE.
+
+    Returns (cache file mtime, text). A failed download falls back to the old
+    file, which is then kept for TLE_RETRY_AFTER before downloading again.
+    """
+    path = _TLE_CACHE_DIR / f"{name}.tle"
+    if path.exists() and (
+        time.time() - path.stat().st_mtime < TLE_MAX_AGE or time.monotonic() < _TLE_RETRY_AT.get(name, 0.0)
+    ):
+        return path.stat().st_mtime, path.read_text()
     try:
-        resp = httpx.get(url, timeout=10)
+        resp = http_client.client().get(_CELESTRAK_URL.format(query=query))
         resp.raise_for_status()
-        return resp.json().get("info", {}).get("satcount", 0)
     except Exception:
-        return 0
+        _TLE_RETRY_AT[name] = time.monotonic() + TLE_RETRY_AFTER
+        if path.exists():
+            return path.stat().st_mtime, path.read_text()
+        raise
+
+    _TLE_CACHE_DIR.mkdir(exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(resp.text)
+    tmp.replace(path)
+    return path.stat().st_mtime, resp.text
 
 
 class SatellitesScreen(Screen):
     name = "satellites"
+    ttl = 900.0  # 15 minutes: 4 requests/hour per category, within the free tier's 100/hour
+    snapshot_fields = ("counts",)
 
-    def __init__(self, lat: float, lon: float, min_elevation: int = 30):
+    def __init__(
+        self,
+        lat: float,
+        lon: float,
+        min_elevation: int = 30,
+        categories: dict[str, int] | None = None,
+        engine: str = "n2yo",
+        tle_sources: dict[str, str] | None = None,
+        hourly_limit: int = N2YO_HOURLY_LIMIT,
+    ):
         self.lat = lat
         self.lon = lon
+        self.min_elevation = min_elevation
         self.search_radius = 90 - min_elevation
+        # "n2yo": one remote "above" call per category and refresh.
+        # "tle": TLEs downloaded daily, visibility computed locally (needs sgp4 + numpy).
+        self.engine = engine
+        if engine == "tle":
+            self.categories = tle_sources or DEFAULT_TLE_SOURCES
+            self.ttl = 60.0  # no network per refresh, so refresh often
+        else:
+            self.categories = categories or DEFAULT_CATEGORIES
+        self.hourly_limit = hourly_limit
+        # Read from .env on the first N2YO fetch, not at startup.
+        self.api_key: str | None = None
+        # Category name -> (TLE file mtime, parsed satellites).
+        self._orbits: dict[str, tuple[float, object]] = {}
         self.font_sm = load_font("FreePixel.ttf", 14)
         self.font = load_font("FreePixel.ttf", 19)
-        self.iss_above: bool = False
-        self.galileo: int = 0
-        self.starlink: int = 0
-        self._fetched: bool = False
-        self._last_fetch_at: float = 0
-
-    def prefetch(self):
-        if self._fetched and (time.time() - self._last_fetch_at) < _FETCH_INTERVAL:
-            return
-        api_key = dotenv_values(_ENV_PATH).get("N2YO_API_KEY", "")
-        if not api_key:
-            return
-        self.iss_above = (
-            _fetch_count(self.lat, self.lon, 2, api_key, self.search_radius) > 0
-        )
-        self.galileo = _fetch_count(self.lat, self.lon, 22, api_key, self.search_radius)
-        self.starlink = _fetch_count(
-            self.lat, self.lon, 52, api_key, self.search_radius
+        # Category name -> objects above; None until the first fetch.
+        self.counts: dict[str, int] | None = None
+
+    def snapshot_key(self):
+        return f"{self.engine} {self.lat},{self.lon} >{self.min_elevation} {','.join(self.categories)}"
+
+    def fetch(self):
+        if self.engine == "tle":
+            self._fetch_local()
+        else:
+            return self._fetch_n2yo()
+
+    def _fetch_local(self):
+        from screens import orbits
+
+        counts = {}
+        for name, query in self.categories.items():
+            mtime, text = _load_tles(name, query)
+            cached = self._orbits.get(name)
+            if cached is None or cached[0] != mtime:
+                cached = self._orbits[name] = (mtime, orbits.parse_tles(text))
+            sats = cached[1]
+            counts[name] = (
+                orbits.count_above(sats, self.lat, self.lon, self.min_elevation) if sats else 0
+            )
+        self.counts = counts
+
+    def _fetch_n2yo(self):
+        if self.api_key is None:
+            from dotenv import dotenv_values
+
+            self.api_key = dotenv_values(_ENV_PATH).get("N2YO_API_KEY") or ""
+        if not self.api_key:
+            raise RuntimeError("N2YO_API_KEY is not set in .env")
+        if budget_for(self.api_key, self.hourly_limit).remaining() < len(self.categories):
+            raise RuntimeError("N2YO hourly request budget used up")
+
+        names = list(self.categories)
+        results = list(
+            _POOL.map(
+                lambda name: _N2YO.get(
+                    (self.categories[name], self.search_radius, self.api_key), (self.lat, self.lon), self.ttl
+                ),
+                names,
+            )
         )
-        self._fetched = True
-        self._last_fetch_at = time.time()
+        self.counts = {name: count for name, (_, count) in zip(names, results)}
+        # As old as the oldest count, some of which may be shared.
+        return min(fetched_at for fetched_at, _ in results)
+
+    def fingerprint(self):
+        return (self.counts,)
 
     def draw(self, draw, width, height):
-        if not self._fetched:
+        if self.counts is None:
             lines = [("Space objects", self.font_sm), ("N/A", self.font)]
         else:
             lines = [("Space objects", self.font_sm)]
-            if self.iss_above:
-                lines.append(("ISS above!", self.font))
-            lines += [
-                (f"{self.galileo} Galileo", self.font),
-                (f"{self.starlink} Starlink", self.font),
-            ]
-
-        spacing = 3
-        bboxes = [draw.textbbox((0, 0), text, font=font) for text, font in lines]
-        heights = [b[3] - b[1] for b in bboxes]
-        widths = [b[2] - b[0] for b in bboxes]
-        total_h = sum(heights) + spacing * (len(lines) - 1)
-        y = (height - total_h) // 2
-
-        for i, (text, font) in enumerate(lines):
-            draw.text(((width - widths[i]) // 2, y), text, fill="white", font=font)
-            y += heights[i] + spacing
+            for name, count in self.counts.items():
+                if name == "ISS":
+                    if count:
+                        lines.append(("ISS above!", self.font))
+                else:
+                    lines.append((f"{count} {name}", self.font))
+
+        draw_lines(draw, lines, width, height, spacing=3)
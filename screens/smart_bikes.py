@@ -1,10 +1,28 @@
-import httpx
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from screens.base import Screen, load_font
+from screens import http_client
+from screens.base import Screen, draw_lines, load_font
 
 ALL_STATIONS_URL = "https://serverapp.ratas.tartu.ee/api/map/stations/"
 STATION_INFO_BASE_URL = "https://serverapp.ratas.tartu.ee/api/map/station/"
 RATAS_API_TIMEOUT = 60 * 2
+# Stations are added or moved rarely; check for a new list once a day.
+STATION_INDEX_MAX_AGE = 24 * 3600
+
+_STATIONS_CACHE_PATH = Path(__file__).resolve().parent.parent / ".ratas_stations.json"
+
+# Per-station requests in flight at once when the bulk list has no counts.
+MAX_PARALLEL_REQUESTS = 4
+# Fields _count_bikes_from_raw_station_info() needs.
+_COUNT_KEYS = {"name", "bikes_primary", "bikes_secondary", "pedelecs_primary", "pedelecs_secondary"}
+# Of those, the ones that change with every bike taken or returned.
+_LIVE_KEYS = _COUNT_KEYS - {"name"}
+
+_POOL = ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS, thread_name_prefix="ratas")
 
 HEADERS = {
     "accept": "application/json, text/plain, */*",
@@ -13,26 +31,154 @@ HEADERS = {
 }
 
 
-class SmartBikeManager:
-    def __init__(self):
-        self.all_stations = self._get_alL_stations()
+def _layout(stations) -> dict[str, dict]:
+    # The station list without the live count fields, keyed by station id.
+    return {
+        str(station["station_id"]): {key: value for key, value in station.items() if key not in _LIVE_KEYS}
+        for station in stations
+    }
 
-    def _get_alL_stations(self, url: str = ALL_STATIONS_URL):
-        response = httpx.get(url, headers=HEADERS, timeout=RATAS_API_TIMEOUT)
-        response.raise_for_status()
-        return response.json()["results"]
+
+class StationIndex:
+    """
+    The Ratas station list, indexed by name and by station id.
+
+    Nothing is fetched on construction. The index is loaded from disk on
+    first use and refreshed in the background once older than `max_age`,
+    using conditional requests (ETag / Last-Modified) so an unchanged list
+    costs a 304 instead of the full payload. The file on disk is only
+    rewritten when the station list changes, not on every refresh.
+    """
+
+    def __init__(self, path: Path = _STATIONS_CACHE_PATH, max_age: float = STATION_INDEX_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._by_name: dict[str, dict] = {}
+        self._by_id: dict[str, dict] = {}
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._fetched_at: float = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    def by_name(self, name: str) -> dict | None:
+        self._ensure_loaded()
+        return self._by_name.get(name)
+
+    def by_id(self, station_id) -> dict | None:
+        self._ensure_loaded()
+        return self._by_id.get(str(station_id))
+
+    def stations(self) -> list[dict]:
+        self._ensure_loaded()
+        return list(self._by_id.values())
+
+    def refresh(self) -> None:
+        """Fetch the station list now (blocking), unless the server says it's unchanged."""
+        with self._refreshing:
+            headers = dict(HEADERS)
+            if self._etag:
+                headers["if-none-match"] = self._etag
+            if self._last_modified:
+                headers["if-modified-since"] = self._last_modified
+
+            response = http_client.client().get(ALL_STATIONS_URL, headers=headers, timeout=RATAS_API_TIMEOUT)
+            if response.status_code == 304:
+                self._fetched_at = time.time()
+                return
+            response.raise_for_status()
+            etag = response.headers.get("etag")
+            results = response.json()["results"]
+            # The payload may carry live bike counts, which change every few
+            # minutes; those stay in memory. The file is only rewritten when
+            # the stations themselves (ids, names, places) changed.
+            changed = (etag is None or etag != self._etag) and _layout(results) != _layout(self._by_id.values())
+            self._set(
+                results,
+                etag=etag,
+                last_modified=response.headers.get("last-modified"),
+                fetched_at=time.time(),
+            )
+            if changed:
+                self._save()
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh on a daemon thread if the index is stale and none is running."""
+        self._ensure_loaded()
+        if time.time() - self._fetched_at < self.max_age or self._refreshing.locked():
+            return
+        threading.Thread(target=self._refresh_quietly, daemon=True).start()
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception:
+            pass  # keep the current index; retried on the next stale lookup
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                data = json.loads(self.path.read_text())
+                self._set(
+                    data["results"],
+                    etag=data.get("etag"),
+                    last_modified=data.get("last_modified"),
+                    fetched_at=data.get("fetched_at", 0.0),
+                )
+            except (OSError, ValueError, KeyError):
+                pass
+            self._loaded = True
+
+    def _set(self, results: list[dict], etag, last_modified, fetched_at: float):
+        # Build the new dicts first and swap them in, so readers never see a half-built index.
+        self._by_name = {station["name"]: station for station in results}
+        self._by_id = {str(station["station_id"]): station for station in results}
+        self._etag = etag
+        self._last_modified = last_modified
+        self._fetched_at = fetched_at
+
+    def _save(self):
+        data = {
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "fetched_at": self._fetched_at,
+            "results": list(self._by_id.values()),
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.replace(self.path)
+
+
+class SmartBikeManager:
+    def __init__(self, index: StationIndex | None = None):
+        self.index = index or StationIndex()
+        # Whether the all-stations payload includes bike counts; None = not checked yet.
+        self._bulk_counts: bool | None = None
 
     def _get_station_info_by_name(self, station_name: str) -> dict:
-        for station_info in self.all_stations:
-            if station_info["name"] == station_name:
-                return station_info
+        station_info = self.index.by_name(station_name)
+        if station_info is None:
+            # Not on disk yet (first run) or a new station: fetch the list now.
+            # This runs on a prefetch worker, never at startup.
+            self.index.refresh()
+            station_info = self.index.by_name(station_name)
+            if station_info is None:
+                raise KeyError(f"unknown Ratas station {station_name!r}")
+        else:
+            self.index.refresh_in_background()
+        return station_info
 
     def _get_raw_bikes_by_station_name(self, station_name: str):
         station_info = self._get_station_info_by_name(station_name)
         station_id = station_info["station_id"]
         url = f"{STATION_INFO_BASE_URL}{station_id}/"
 
-        response = httpx.get(url, headers=HEADERS, timeout=RATAS_API_TIMEOUT)
+        response = http_client.client().get(url, headers=HEADERS, timeout=RATAS_API_TIMEOUT)
         response.raise_for_status()
         return response.json()
 
@@ -50,51 +196,72 @@ class SmartBikeManager:
         info = self._get_raw_bikes_by_station_name(station_name)
         return self._count_bikes_from_raw_station_info(info)
 
+    def get_bikes_on_stations(self, station_names: list[str]) -> list[dict]:
+        """Bike counts for several stations, in the given order.
+
+        If the all-stations payload carries the counts, one (conditional)
+        request for the whole list answers every station. Otherwise the
+        per-station requests go out concurrently, at most
+        MAX_PARALLEL_REQUESTS at a time.
+        """
+        if self._bulk_counts is None:
+            stations = [self._get_station_info_by_name(name) for name in station_names]
+            self._bulk_counts = all(_COUNT_KEYS <= station.keys() for station in stations)
+
+        if self._bulk_counts:
+            # A 304 means the counts in the index are still current.
+            self.index.refresh()
+            return [
+                self._count_bikes_from_raw_station_info(self._get_station_info_by_name(name))
+                for name in station_names
+            ]
+        return list(_POOL.map(self.get_bikes_on_station, station_names))
+
 
 class SmartBikesScreen(Screen):
     name = "smart_bikes"
+    ttl = 120.0
+    snapshot_fields = ("bikes",)
 
-    def __init__(self, station_name: str):
+    def __init__(self, station_names: list[str], page_seconds: float | None = None):
         self.font = load_font("FreePixel.ttf", 20)
         self.manager = SmartBikeManager()
-        self.station_name = station_name
-        self.bikes_info = None
+        self.station_names = station_names
+        # With several stations the screen pages through them while it is
+        # shown, `page_seconds` each (default: its duration split evenly).
+        self.page_seconds = page_seconds
+        self.live = len(station_names) > 1
+        self.bikes: list[dict] | None = None
+        # time.monotonic() when the screen was last switched to; pages count from it.
+        self._shown_at = 0.0
 
-    def prefetch(self):
-        self.bikes_info = self.manager.get_bikes_on_station(self.station_name)
+    def snapshot_key(self):
+        return ",".join(self.station_names)
 
-    def draw(self, draw, width, height):
-        if self.bikes_info is None:
-            text = "Loading..."
-            bbox = draw.textbbox((0, 0), text, font=self.font)
-            tw = bbox[2] - bbox[0]
-            th = bbox[3] - bbox[1]
-            draw.text(
-                ((width - tw) // 2, (height - th) // 2),
-                text,
-                fill="white",
-                font=self.font,
-            )
-            return
+    def fetch(self):
+        self.bikes = self.manager.get_bikes_on_stations(self.station_names)
 
-        station = self.bikes_info["station_name"]
-        regular = f"Bikes: {self.bikes_info['regular_bikes']}"
-        electric = f"E-bikes: {self.bikes_info['electric_bikes']}"
+    def on_show(self):
+        self._shown_at = time.monotonic()
 
-        s_bbox = draw.textbbox((0, 0), station, font=self.font)
-        r_bbox = draw.textbbox((0, 0), regular, font=self.font)
-        e_bbox = draw.textbbox((0, 0), electric, font=self.font)
+    def _page(self) -> int:
+        if not self.bikes or len(self.bikes) == 1:
+            return 0
+        page_seconds = self.page_seconds or max(self.interval / len(self.bikes), 1.0)
+        return int((time.monotonic() - self._shown_at) // page_seconds) % len(self.bikes)
 
-        s_w, s_h = s_bbox[2] - s_bbox[0], s_bbox[3] - s_bbox[1]
-        r_w, r_h = r_bbox[2] - r_bbox[0], r_bbox[3] - r_bbox[1]
-        e_w, e_h = e_bbox[2] - e_bbox[0], e_bbox[3] - e_bbox[1]
+    def fingerprint(self):
+        return (self.bikes, self._page())
 
-        spacing = 4
-        total_h = s_h + spacing + r_h + spacing + e_h
-        y = (height - total_h) // 2
+    def draw(self, draw, width, height):
+        if self.bikes is None:
+            lines = ["Loading..."]
+        else:
+            bikes_info = self.bikes[self._page()]
+            lines = [
+                bikes_info["station_name"],
+                f"Bikes: {bikes_info['regular_bikes']}",
+                f"E-bikes: {bikes_info['electric_bikes']}",
+            ]
 
-        draw.text(((width - s_w) // 2, y), station, fill="white", font=self.font)
-        y += s_h + spacing
-        draw.text(((width - r_w) // 2, y), regular, fill="white", font=self.font)
-        y += r_h + spacing
-        draw.text(((width - e_w) // 2, y), electric, fill="white", font=self.font)
+        draw_lines(draw, [(line, self.font) for line in lines], width, height, spacing=4)
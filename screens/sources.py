@@ -0,0 +1,121 @@
+"""
+Upstream data shared between screens.
+
+Screens don't call a provider directly when others may want the same answer;
+they ask a SharedSource for a (group, item) key: the group is what is asked
+for (provider endpoint and fields), the item where (usually a location).
+Equal keys are fetched once and every screen gets the same result. Providers
+that can answer for several items in one request (Open-Meteo takes
+comma-separated coordinates) also get the other subscribed items of the group
+fetched along whenever one of them is needed.
+"""
+
+import threading
+import time
+from collections.abc import Hashable
+from typing import Callable
+
+# When one item of a group is fetched, subscribed items of the same group whose
+# data is at least this fraction of max_age old are fetched with it, so screens
+# refreshing on similar schedules end up sharing one request.
+BATCH_AHEAD = 0.5
+
+# fetch(group, items) -> one result per item, same order.
+BatchFetcher = Callable[[Hashable, list], list]
+
+_SOURCES: list["SharedSource"] = []
+
+
+class SharedSource:
+    """
+    Deduplicating, batching cache in front of one provider.
+
+    `get()` returns the cached result if it is younger than `max_age`,
+    otherwise fetches it, together with the time it was fetched. Fetches are
+    single-flight per item: callers asking for an item that is already being
+    fetched (on its own or as part of another item's batch) wait for that
+    request; other items, even of the same group, don't wait on it.
+    `max_batch` is how many items the provider accepts per request; with 1
+    there is deduplication but no batching. Items only take part in batches
+    after `subscribe()`.
+    """
+
+    def __init__(self, name: str, fetch: BatchFetcher, max_batch: int = 1):
+        self.name = name
+        self._fetch = fetch
+        self.max_batch = max_batch
+        self.requests = 0
+        self.hits = 0
+        self._subscribed: dict[Hashable, dict[Hashable, int]] = {}
+        # (group, item) -> (fetched_at, result)
+        self._cache: dict[tuple, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+        # (group, item) -> set when the request fetching it has finished.
+        self._in_flight: dict[tuple, threading.Event] = {}
+        _SOURCES.append(self)
+
+    def subscribe(self, group: Hashable, item: Hashable) -> None:
+        with self._lock:
+            items = self._subscribed.setdefault(group, {})
+            items[item] = items.get(item, 0) + 1
+
+    def _cached(self, group, item, max_age: float, now: float) -> tuple | None:
+        entry = self._cache.get((group, item))
+        if entry is not None and now - entry[0] < max_age:
+            return entry
+        return None
+
+    def get(self, group: Hashable, item: Hashable, max_age: float) -> tuple[float, object]:
+        """
+        (fetched_at, result) for (group, item), fetched if there is none
+        younger than `max_age`. `fetched_at` is the wall-clock time the
+        request was sent, so callers can age shared data from when it was
+        really fetched. Raises if the fetch fails.
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                entry = self._cached(group, item, max_age, now)
+                if entry is not None:
+                    self.hits += 1
+                    return entry
+                pending = self._in_flight.get((group, item))
+                if pending is None:
+                    batch = [item]
+                    for other in self._subscribed.get(group, {}):
+                        if len(batch) >= self.max_batch:
+                            break
+                        if (
+                            other != item
+                            and (group, other) not in self._in_flight
+                            and self._cached(group, other, max_age * BATCH_AHEAD, now) is None
+                        ):
+                            batch.append(other)
+                    done = threading.Event()
+                    for batch_item in batch:
+                        self._in_flight[(group, batch_item)] = done
+                    break
+            # Someone else is fetching this item: use their result, or try
+            # again ourselves if their request failed.
+            pending.wait()
+
+        try:
+            sent = time.time()
+            results = self._fetch(group, batch)
+            with self._lock:
+                self.requests += 1
+                for batch_item, result in zip(batch, results):
+                    self._cache[(group, batch_item)] = (sent, result)
+            return sent, results[0]
+        finally:
+            with self._lock:
+                for batch_item in batch:
+                    del self._in_flight[(group, batch_item)]
+            done.set()
+
+    def stats(self) -> str:
+        return f"{self.name}: {self.requests} requests, {self.hits} shared"
+
+
+def registered() -> list[SharedSource]:
+    return list(_SOURCES)
@@ -1,13 +1,13 @@
 import json
+import os
+import threading
 import time
+from datetime import date
 from pathlib import Path
 
-import httpx
-from dotenv import dotenv_values
-
-from screens.base import Screen, load_font
-
-_FETCH_INTERVAL = 300  # seconds (5 minutes)
+from screens import http_client
+from screens.base import Screen, draw_lines, load_font
+from screens.strava_activities import RIDE_TYPES, ActivityStore, summarize
 
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 _CACHE_PATH = _PROJECT_ROOT / ".strava_cache.json"
@@ -15,6 +15,13 @@ _ENV_PATH = _PROJECT_ROOT / ".env"
 
 STRAVA_TOKEN_URL = "https://www.strava.com/api/v3/oauth/token"
 STRAVA_STATS_URL = "https://www.strava.com/api/v3/athletes/{athlete_id}/stats"
+STRAVA_ACTIVITIES_URL = "https://www.strava.com/api/v3/athlete/activities"
+# Refresh the access token this many seconds before it expires, in the
+# background; a token this close to expiring is refreshed inline instead.
+REFRESH_MARGIN = 600
+EXPIRY_SLACK = 60
+# First retry after a failed background refresh, doubling up to REFRESH_MARGIN / 2.
+RETRY_AFTER = 30
 
 _PERIOD_KEYS = {
     "ytd": "ytd_ride_totals",
@@ -23,30 +30,53 @@ _PERIOD_KEYS = {
 }
 
 
-class StravaClient:
-    """Manages Strava OAuth2 tokens and API calls."""
+class StravaTokens:
+    """
+    Strava OAuth2 access token, refreshed before it expires.
 
-    def __init__(self):
-        env = dotenv_values(_ENV_PATH)
-        self.client_id = env["STRAVA_CLIENT_ID"]
-        self.client_secret = env["STRAVA_CLIENT_SECRET"]
-        self.athlete_id = env["STRAVA_ATHLETE_ID"]
-        self._initial_refresh_token = env["STRAVA_REFRESH_TOKEN"]
+    Strava access tokens last six hours. A daemon timer refreshes the token
+    `margin` seconds before `expires_at`, so `get()` normally returns a valid
+    token without touching the network; it only refreshes inline on a cold
+    start or after background refreshes kept failing. Refreshes are
+    single-flight: callers that find one in progress wait for it and use its
+    result instead of sending their own, which matters because every refresh
+    rotates the refresh token. The cache file is replaced atomically.
+    """
 
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        refresh_token: str,
+        cache_path: Path = _CACHE_PATH,
+        token_url: str = STRAVA_TOKEN_URL,
+        margin: float = REFRESH_MARGIN,
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.cache_path = Path(cache_path)
+        self.token_url = token_url
+        self.margin = margin
         self.access_token: str | None = None
-        self.refresh_token: str | None = None
-        self.expires_at: int = 0
+        self.refresh_token = refresh_token
+        self.expires_at: float = 0
+        self.refreshes = 0
+        self._failures = 0
+        self._refreshing = threading.Lock()
+        self._timer: threading.Timer | None = None
         self._load_cache()
+        if self.access_token is not None:
+            self._schedule()
 
     def _load_cache(self):
-        if _CACHE_PATH.exists():
-            try:
-                data = json.loads(_CACHE_PATH.read_text())
-                self.access_token = data.get("access_token")
-                self.refresh_token = data.get("refresh_token")
-                self.expires_at = data.get("expires_at", 0)
-            except (json.JSONDecodeError, KeyError):
-                pass
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("refresh_token"):
+            self.access_token = data.get("access_token")
+            self.refresh_token = data["refresh_token"]
+            self.expires_at = data.get("expires_at", 0)
 
     def _save_cache(self):
         data = {
@@ -54,74 +84,185 @@ class StravaClient:
             "refresh_token": self.refresh_token,
             "expires_at": self.expires_at,
         }
-        _CACHE_PATH.write_text(json.dumps(data, indent=2))
-
-    def _needs_refresh(self) -> bool:
-        return self.access_token is None or time.time() >= (self.expires_at - 60)
-
-    def _refresh_access_token(self):
-        token_to_use = self.refresh_token or self._initial_refresh_token
-        resp = httpx.post(
-            STRAVA_TOKEN_URL,
-            data={
-                "client_id": self.client_id,
-                "client_secret": self.client_secret,
-                "grant_type": "refresh_token",
-                "refresh_token": token_to_use,
-            },
-            timeout=10,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+        # Tokens are credentials: owner-only, and never a half-written file
+        # (that would lose the rotated refresh token).
+        tmp = self.cache_path.with_suffix(".tmp")
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(self.cache_path)
 
-        self.access_token = data["access_token"]
-        self.refresh_token = data["refresh_token"]
-        self.expires_at = data["expires_at"]
-        self._save_cache()
+    def _valid(self) -> bool:
+        return self.access_token is not None and time.time() < self.expires_at - EXPIRY_SLACK
 
-    def _get_access_token(self) -> str:
-        if self._needs_refresh():
-            self._refresh_access_token()
-        return self.access_token
+    def get(self) -> str:
+        """A valid access token; refreshes first only if there is none."""
+        token = self.access_token
+        if token is not None and self._valid():
+            return token
+        return self.refresh(stale=token)
 
-    def get_ride_stats(self) -> dict:
-        token = self._get_access_token()
-        url = STRAVA_STATS_URL.format(athlete_id=self.athlete_id)
-        resp = httpx.get(
-            url,
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=10,
-        )
+    def refresh(self, stale: str | None = None) -> str:
+        """
+        Exchange the refresh token for a new access token (blocking) and return it.
+
+        `stale` is the token the caller found unusable. If another thread has
+        replaced it while this one waited, that result is returned as is.
+        """
+        with self._refreshing:
+            if self.access_token != stale and self._valid():
+                return self.access_token
+            resp = http_client.client().post(
+                self.token_url,
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "grant_type": "refresh_token",
+                    "refresh_token": self.refresh_token,
+                },
+            )
+            resp.raise_for_status()
+            data = resp.json()
+
+            self.refresh_token = data["refresh_token"]
+            self.expires_at = data["expires_at"]
+            self.access_token = data["access_token"]
+            self.refreshes += 1
+            self._save_cache()
+            self._failures = 0
+            self._schedule()
+            return self.access_token
+
+    def _schedule(self, delay: float | None = None):
+        if delay is None:
+            delay = max(self.expires_at - self.margin - time.time(), 0.0)
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh(stale=self.access_token)
+        except Exception:
+            # The current token may still have a while to go; try again
+            # sooner and sooner. Once it has expired, get() refreshes inline.
+            self._failures += 1
+            self._schedule(min(RETRY_AFTER * 2 ** (self._failures - 1), self.margin / 2))
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+
+
+class StravaClient:
+    """Strava API calls, authenticated through StravaTokens."""
+
+    def __init__(
+        self,
+        tokens: StravaTokens | None = None,
+        athlete_id: str | None = None,
+        stats_url: str = STRAVA_STATS_URL,
+        activities_url: str = STRAVA_ACTIVITIES_URL,
+    ):
+        # Without `tokens`, credentials are read from .env on the first request
+        # (on a prefetch worker), not at startup; a missing key fails that fetch.
+        self.tokens = tokens
+        self.athlete_id = athlete_id
+        self.stats_url = stats_url
+        self.activities_url = activities_url
+        self._lock = threading.Lock()
+
+    def _load(self) -> StravaTokens:
+        with self._lock:
+            if self.tokens is None:
+                from dotenv import dotenv_values
+
+                env = dotenv_values(_ENV_PATH)
+                self.athlete_id = env["STRAVA_ATHLETE_ID"]
+                self.tokens = StravaTokens(env["STRAVA_CLIENT_ID"], env["STRAVA_CLIENT_SECRET"], env["STRAVA_REFRESH_TOKEN"])
+            return self.tokens
+
+    def _get(self, url: str, params: dict | None = None):
+        tokens = self._load()
+        token = tokens.get()
+        resp = http_client.client().get(url, params=params, headers={"Authorization": f"Bearer {token}"})
+        if resp.status_code == 401:
+            # Revoked or expired early: refresh once (coalesced) and retry.
+            token = tokens.refresh(stale=token)
+            resp = http_client.client().get(url, params=params, headers={"Authorization": f"Bearer {token}"})
         resp.raise_for_status()
         return resp.json()
 
+    def get_ride_stats(self) -> dict:
+        self._load()
+        return self._get(self.stats_url.format(athlete_id=self.athlete_id))
+
+    def get_activities(self, after: int, page: int, per_page: int) -> list[dict]:
+        """One page of the athlete's activities that started after `after` (epoch seconds), oldest first."""
+        return self._get(self.activities_url, {"after": after, "page": page, "per_page": per_page})
+
 
 class StravaScreen(Screen):
     name = "strava"
+    ttl = 300.0  # 5 minutes
+    snapshot_fields = ("distance_km", "summary")
 
-    def __init__(self, goal_km: float = 1000, period: str = "ytd"):
+    def __init__(self, goal_km: float = 1000, period: str = "ytd", source: str = "stats", sport_types: list[str] | None = None):
         self.font = load_font("FreePixel.ttf", 16)
+        self.font_sm = load_font("FreePixel.ttf", 12)
         self.goal_km = goal_km
+        self.period = period
         self.period_key = _PERIOD_KEYS.get(period, "ytd_ride_totals")
+        # "stats": one /athletes/{id}/stats call per refresh, distance only.
+        # "activities" (opt-in): incremental activity sync, totals computed
+        # locally. The activity list leaves out "Only Me" activities, which
+        # the stats endpoint counts, so its totals can come out lower.
+        self.source = source
+        self.sport_types = tuple(sport_types) if sport_types else RIDE_TYPES
         self.client = StravaClient()
+        # Loaded from disk on the first fetch.
+        self.activities: ActivityStore | None = None
         self.distance_km: float | None = None
-        self._last_fetch_at: float = 0
+        self.summary: dict | None = None
 
-    def prefetch(self):
-        if (
-            self.distance_km is not None
-            and (time.time() - self._last_fetch_at) < _FETCH_INTERVAL
-        ):
-            return
-        try:
+    def snapshot_key(self):
+        return f"{self.source} {self.period_key} {self.goal_km} {','.join(self.sport_types)}"
+
+    def fetch(self):
+        if self.source == "stats":
             stats = self.client.get_ride_stats()
             ride_totals = stats[self.period_key]
             self.distance_km = ride_totals["distance"] / 1000.0
-            self._last_fetch_at = time.time()
-        except Exception:
-            self.distance_km = None
+            return
+        if self.activities is None:
+            self.activities = ActivityStore()
+        self.activities.sync(self.client.get_activities)
+        # Recomputed on every refresh, new activities or not: the week, the
+        # streak and the pace also move with the date.
+        summary = summarize(self.activities, date.today(), self.period, self.goal_km, self.sport_types)
+        self.summary, self.distance_km = summary, summary["distance_km"]
+
+    def fingerprint(self):
+        return (self.distance_km, self.summary)
 
     def draw(self, draw, width, height):
+        if self.summary is not None:
+            s = self.summary
+            if s["pace_km"] is not None:
+                pace = f"{s['pace_km']:+.0f} km vs pace"
+            else:
+                pace = f"{s['distance_km'] / self.goal_km * 100 if self.goal_km > 0 else 0:.1f}% done"
+            rows = [
+                (f"{s['distance_km']:.0f}/{self.goal_km:.0f} km", self.font),
+                (pace, self.font_sm),
+                (f"Week {s['week_km']:.0f} km", self.font_sm),
+                (f"Streak {s['streak_days']} d", self.font_sm),
+            ]
+            draw_lines(draw, rows, width, height, spacing=3)
+            return
         if self.distance_km is None:
             lines = ["Strava Rides", "N/A"]
         else:
@@ -135,19 +276,4 @@ class StravaScreen(Screen):
                 f"{pct:.1f}% done",
             ]
 
-        spacing = 4
-        bboxes = [draw.textbbox((0, 0), line, font=self.font) for line in lines]
-        heights = [b[3] - b[1] for b in bboxes]
-        widths = [b[2] - b[0] for b in bboxes]
-
-        total_h = sum(heights) + spacing * (len(lines) - 1)
-        y = (height - total_h) // 2
-
-        for i, line in enumerate(lines):
-            draw.text(
-                ((width - widths[i]) // 2, y),
-                line,
-                fill="white",
-                font=self.font,
-            )
-            y += heights[i] + spacing
+        draw_lines(draw, [(line, self.font) for line in lines], width, height, spacing=4)
@@ -0,0 +1,234 @@
+"""
+Strava activity history kept locally and synced incrementally, with the
+totals the screen shows (period, week, month, streak, goal pace) computed
+from it instead of asked for.
+
+The first sync pages through the whole history (200 activities per request).
+After that every sync asks only for activities that started after the newest
+one stored, minus a small overlap so rides uploaded a day late still arrive.
+A steady-state refresh is therefore one request, however long the history.
+Activities edited inside the overlap are updated; older edits and deletions
+are not seen.
+
+The store is columnar (one `array` per field), about 40 bytes per activity in
+memory, and is written to disk atomically, only when a sync brought changes.
+"""
+
+import json
+import os
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable
+
+_STORE_PATH = Path(__file__).resolve().parent.parent / ".strava_activities.json"
+
+# Activities per request; Strava's maximum.
+PER_PAGE = 200
+# Each sync re-asks for activities started this long before the newest stored one.
+SYNC_OVERLAP = 2 * 24 * 3600
+# What counts as a ride (Strava sport_type values).
+RIDE_TYPES = ("Ride", "VirtualRide", "EBikeRide", "GravelRide", "MountainBikeRide", "EMountainBikeRide", "Velomobile")
+# Days in Strava's "recent" period.
+RECENT_DAYS = 28
+
+# fetch_page(after, page, per_page) -> list of activity dicts from /athlete/activities.
+PageFetcher = Callable[[int, int, int], list[dict]]
+
+
+def _epoch(timestamp: str) -> int:
+    # "2024-05-01T05:12:33Z"
+    return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+
+
+class ActivityStore:
+    """
+    Activities as parallel columns: `ids`, `starts` (UTC epoch seconds),
+    `days` (local start date as a date ordinal), `distance` (m), `moving_time`
+    (s), `elevation` (m) and `sport` (index into `sport_types`).
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path = _STORE_PATH):
+        self.path = Path(path)
+        self.ids = array("q")
+        self.starts = array("q")
+        self.days = array("l")
+        self.distance = array("d")
+        self.moving_time = array("l")
+        self.elevation = array("d")
+        self.sport = array("B")
+        self.sport_types: list[str] = []
+        self._index: dict[int, int] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.VERSION:
+            return  # full resync
+        self.sport_types = data["sport_types"]
+        for name in ("ids", "starts", "days", "distance", "moving_time", "elevation", "sport"):
+            getattr(self, name).extend(data[name])
+        self._index = {activity_id: i for i, activity_id in enumerate(self.ids)}
+
+    def save(self) -> None:
+        data = {"version": self.VERSION, "sport_types": self.sport_types}
+        for name in ("ids", "starts", "days", "distance", "moving_time", "elevation", "sport"):
+            data[name] = getattr(self, name).tolist()
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(self.path)
+
+    def cursor(self) -> int:
+        """The `after=` value for the next sync."""
+        if not self.starts:
+            return 0
+        return max(max(self.starts) - SYNC_OVERLAP, 0)
+
+    def add(self, activity: dict) -> bool:
+        """Insert or update one activity from the API; True if anything changed."""
+        sport_type = activity.get("sport_type") or activity.get("type") or ""
+        if sport_type not in self.sport_types:
+            self.sport_types.append(sport_type)
+        row = (
+            _epoch(activity["start_date"]),
+            date.fromisoformat(activity["start_date_local"][:10]).toordinal(),
+            float(activity.get("distance") or 0.0),
+            int(activity.get("moving_time") or 0),
+            float(activity.get("total_elevation_gain") or 0.0),
+            self.sport_types.index(sport_type),
+        )
+        columns = (self.starts, self.days, self.distance, self.moving_time, self.elevation, self.sport)
+        i = self._index.get(activity["id"])
+        if i is None:
+            self._index[activity["id"]] = len(self.ids)
+            self.ids.append(activity["id"])
+            for column, value in zip(columns, row):
+                column.append(value)
+            return True
+        if tuple(column[i] for column in columns) == row:
+            return False
+        for column, value in zip(columns, row):
+            column[i] = value
+        return True
+
+    def sync(self, fetch_page: PageFetcher, per_page: int = PER_PAGE) -> tuple[int, int]:
+        """Fetch what's new since the last sync and save if anything changed. Returns (changed, requests)."""
+        after = self.cursor()
+        changed = requests = 0
+        page = 1
+        try:
+            while True:
+                activities = fetch_page(after, page, per_page)
+                requests += 1
+                changed += sum(self.add(activity) for activity in activities)
+                if len(activities) < per_page:
+                    break
+                page += 1
+        finally:
+            # Pages that arrived before a failure are kept; the next sync
+            # carries on from them.
+            if changed:
+                self.save()
+        return changed, requests
+
+
+def _selected(store: ActivityStore, sport_types) -> set[int] | None:
+    # Indices into store.sport_types to include; None means every type.
+    if sport_types is None:
+        return None
+    return {i for i, name in enumerate(store.sport_types) if name in sport_types}
+
+
+def daily_distance(store: ActivityStore, sport_types=RIDE_TYPES) -> dict[int, float]:
+    """Metres per local date ordinal."""
+    selected = _selected(store, sport_types)
+    totals: dict[int, float] = {}
+    for day, distance, sport in zip(store.days, store.distance, store.sport):
+        if selected is None or sport in selected:
+            totals[day] = totals.get(day, 0.0) + distance
+    return totals
+
+
+def weekly_totals(daily: dict[int, float]) -> dict[date, float]:
+    """Kilometres per week, keyed by the week's Monday."""
+    totals: dict[int, float] = {}
+    for day, distance in daily.items():
+        monday = day - (day - 1) % 7  # ordinal 1 (0001-01-01) is a Monday
+        totals[monday] = totals.get(monday, 0.0) + distance / 1000
+    return {date.fromordinal(monday): km for monday, km in sorted(totals.items())}
+
+
+def monthly_totals(daily: dict[int, float]) -> dict[tuple[int, int], float]:
+    """Kilometres per (year, month)."""
+    totals: dict[tuple[int, int], float] = {}
+    for day, distance in daily.items():
+        d = date.fromordinal(day)
+        totals[d.year, d.month] = totals.get((d.year, d.month), 0.0) + distance / 1000
+    return dict(sorted(totals.items()))
+
+
+def streak(daily: dict[int, float], today: date) -> int:
+    """Consecutive days with an activity, up to today (or yesterday while today has none yet)."""
+    day = today.toordinal()
+    if day not in daily:
+        day -= 1
+    days = 0
+    while day in daily:
+        days += 1
+        day -= 1
+    return days
+
+
+def summarize(store: ActivityStore, today: date, period: str = "ytd", goal_km: float = 0.0, sport_types=RIDE_TYPES) -> dict:
+    """
+    Everything StravaScreen draws, as a JSON-serialisable dict: `distance_km`
+    for the period ("ytd", "all" or "recent"), `week_km` and `month_km` so far,
+    `streak_days`, and `pace_km`: how far ahead (+) or behind (-) a steady
+    pace towards `goal_km` for the year the year-to-date total is (ytd with a
+    goal only, else None).
+    """
+    daily = daily_distance(store, sport_types)
+    t = today.toordinal()
+    year_start = date(today.year, 1, 1).toordinal()
+    if period == "all":
+        start = None
+    elif period == "recent":
+        start = t - RECENT_DAYS + 1
+    else:
+        start = year_start
+    week_start = t - (t - 1) % 7
+    month_start = today.replace(day=1).toordinal()
+
+    period_m = week_m = month_m = 0.0
+    for day, distance in daily.items():
+        if day > t:
+            continue
+        if start is None or day >= start:
+            period_m += distance
+        if day >= week_start:
+            week_m += distance
+        if day >= month_start:
+            month_m += distance
+
+    pace_km = None
+    if period == "ytd" and goal_km > 0:
+        year_days = date(today.year + 1, 1, 1).toordinal() - year_start
+        pace_km = round(period_m / 1000 - goal_km * (t - year_start + 1) / year_days, 1)
+    return {
+        "distance_km": period_m / 1000,
+        "week_km": week_m / 1000,
+        "month_km": month_m / 1000,
+        "streak_days": streak(daily, today),
+        "pace_km": pace_km,
+    }
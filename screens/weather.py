@@ -1,108 +1,189 @@
-import httpx
+import time
 
-from screens.base import Screen, load_font
+from screens.base import Screen, draw_lines, draw_text, load_font, text_bbox
+from screens.forecast import CONDITIONS, OPEN_METEO, current, fetch_open_meteo, location, precipitation, today, upcoming
 
+# With the forecast source one request covers two days; refetch every half
+# hour to pick up model updates (Open-Meteo runs most models hourly).
+FORECAST_TTL = 1800.0
+# Temperature graph: hours shown, and the area between header and footer.
+GRAPH_HOURS = 24
+GRAPH_TOP = 18
+GRAPH_BOTTOM = 50
+# Below this (mm) the next hour counts as dry.
+RAIN_THRESHOLD = 0.05
 
-def _fetch_weather(lat: float, lon: float) -> dict | None:
+
+def _fetch_weather(lat: float, lon: float, max_age: float = 0.0) -> tuple[float, dict]:
     """
-    Fetch current weather.
-    Replace URL with your preferred provider.
-    Expected to return:
+    Fetch current weather (Open-Meteo, no API key). Raises on network or API errors.
+    Expected to return the time it was fetched and:
       {
         "temp": float,
         "feels_like": float,
         "condition": str,
       }
     """
-    try:
-        # Example using Open-Meteo (no API key)
-        url = (
-            "https://api.open-meteo.com/v1/forecast"
-            f"?latitude={lat}&longitude={lon}"
-            "&current=temperature_2m,apparent_temperature,weathercode"
-        )
-        resp = httpx.get(url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()["current"]
-
-        condition_map = {
-            0: "Clear sky",
-            1: "Mostly clear",
-            2: "Partly cloudy",
-            3: "Overcast",
-            45: "Fog",
-            48: "Rime fog",
-            51: "Light drizzle",
-            53: "Drizzle",
-            55: "Heavy drizzle",
-            56: "Frzg drizzle",
-            57: "Hvy Frzg drizz",
-            61: "Light rain",
-            63: "Rain",
-            65: "Heavy rain",
-            66: "Frzg rain",
-            67: "Hvy Frzg rain",
-            71: "Light snow",
-            73: "Snow",
-            75: "Heavy snow",
-            77: "Snow grains",
-            80: "Light showers",
-            81: "Showers",
-            82: "Heavy showers",
-            85: "Snow showers",
-            86: "Hvy Sno Shwrs",
-            95: "Thunderstorm",
-            96: "T-Storm+Hail",
-            99: "T-Storm+Hail",
-        }
-
-        return {
-            "temp": round(data["temperature_2m"]),
-            "feels_like": round(data["apparent_temperature"]),
-            "condition": condition_map.get(data["weathercode"], "Weather"),
-        }
-
-    except Exception:
-        return None
+    fetched_at, data = fetch_open_meteo("current", lat, lon, max_age)
+    data = data["current"]
+
+    return fetched_at, {
+        "temp": round(data["temperature_2m"]),
+        "feels_like": round(data["apparent_temperature"]),
+        "condition": CONDITIONS.get(data["weathercode"], "Weather"),
+    }
 
 
 class WeatherScreen(Screen):
     name = "weather"
+    ttl = 600.0  # Open-Meteo updates current conditions every 15 minutes
+    snapshot_fields = ("weather", "forecast")
 
-    def __init__(self, lat: float, lon: float):
+    def __init__(self, lat: float, lon: float, source: str = "current"):
         self.lat = lat
         self.lon = lon
+        # "forecast": hourly/15-minute/daily forecast in one request every
+        # FORECAST_TTL, current values read from it locally at draw time.
+        # "current": one current= request per refresh.
+        self.source = source
+        if source == "forecast":
+            self.ttl = FORECAST_TTL
         self.font_lg = load_font("FreePixel.ttf", 28)
         self.font = load_font("FreePixel.ttf", 18)
         self.font_sm = load_font("FreePixel.ttf", 14)
         self.weather: dict | None = None
+        self.forecast: dict | None = None
+        # Lets other screens' requests for the same kind of data fetch this
+        # location along (one multi-location request).
+        OPEN_METEO.subscribe(source, location(lat, lon))
+
+    def snapshot_key(self):
+        return f"{self.source} {self.lat},{self.lon}"
 
-    def prefetch(self):
-        self.weather = _fetch_weather(self.lat, self.lon)
+    def fetch(self):
+        # Data another screen fetched for this location within our ttl is
+        # reused (and ages from when it was fetched); otherwise this fetch
+        # also brings the other locations.
+        if self.source == "forecast":
+            fetched_at, self.forecast = fetch_open_meteo("forecast", self.lat, self.lon, self.ttl)
+        else:
+            fetched_at, self.weather = _fetch_weather(self.lat, self.lon, self.ttl)
+        return fetched_at
+
+    def _current(self) -> dict | None:
+        if self.forecast is not None:
+            return current(self.forecast, time.time())
+        return self.weather
+
+    def fingerprint(self):
+        # Values for now, so the frame is redrawn when they change, not on
+        # every draw.
+        return (self._current(),)
 
     def draw(self, draw, width, height):
-        if not self.weather:
+        weather = self._current()
+        if not weather:
             rows = [("Weather", self.font_sm), ("N/A", self.font_lg)]
         else:
             rows = [
-                (self.weather["condition"], self.font_sm),
-                (f"{self.weather['temp']}°C", self.font_lg),
-                (f"Feels {self.weather['feels_like']}°", self.font_sm),
+                (weather["condition"], self.font_sm),
+                (f"{weather['temp']}°C", self.font_lg),
+                (f"Feels {weather['feels_like']}°", self.font_sm),
             ]
 
-        spacing = 6
-        bboxes = [draw.textbbox((0, 0), text, font=font) for text, font in rows]
-        heights = [b[3] - b[1] for b in bboxes]
-        widths = [b[2] - b[0] for b in bboxes]
+        draw_lines(draw, rows, width, height, spacing=6)
+
+
+class WeatherGraphScreen(WeatherScreen):
+    """Temperature over the next GRAPH_HOURS hours, from the same forecast."""
+
+    name = "weather_graph"
+
+    def __init__(self, lat: float, lon: float):
+        super().__init__(lat, lon, source="forecast")
+        self.font_md = load_font("FreePixel.ttf", 16)
+        self.font_xs = load_font("FreePixel.ttf", 12)
+
+    def _points(self) -> list[tuple[int, float]]:
+        if self.forecast is None:
+            return []
+        return upcoming(self.forecast, time.time(), GRAPH_HOURS)
+
+    def fingerprint(self):
+        return (self._points(),)
+
+    def draw(self, draw, width, height):
+        points = self._points()
+        if len(points) < 2:
+            draw_lines(draw, [("Forecast", self.font_sm), ("N/A", self.font_lg)], width, height, spacing=6)
+            return
 
-        total_h = sum(heights) + spacing * (len(rows) - 1)
-        y = (height - total_h) // 2
+        header = f"Next {GRAPH_HOURS}h"
+        bbox = text_bbox(header, self.font_md)
+        draw_text(draw, ((width - (bbox[2] - bbox[0])) // 2, -bbox[1]), header, self.font_md)
 
-        for i, (text, font) in enumerate(rows):
-            draw.text(
-                ((width - widths[i]) // 2, y),
-                text,
-                fill="white",
-                font=font,
+        temperatures = [temperature for _, temperature in points]
+        low, high = min(temperatures), max(temperatures)
+        span = (high - low) or 1.0
+        start, end = points[0][0], points[-1][0]
+        line = [
+            (
+                round((t - start) / (end - start) * (width - 1)),
+                round(GRAPH_BOTTOM - (temperature - low) / span * (GRAPH_BOTTOM - GRAPH_TOP)),
             )
-            y += heights[i] + spacing
+            for t, temperature in points
+        ]
+        draw.line(line, fill="white")
+        # Baseline with a tick every 6 hours.
+        draw.line((0, GRAPH_BOTTOM + 1, width - 1, GRAPH_BOTTOM + 1), fill="white")
+        for t in range(start, end + 1, 6 * 3600):
+            x = round((t - start) / (end - start) * (width - 1))
+            draw.point((x, GRAPH_BOTTOM + 2), fill="white")
+
+        footer = f"{low:.0f}° to {high:.0f}°C"
+        bbox = text_bbox(footer, self.font_xs)
+        y = GRAPH_BOTTOM + 3 + (height - GRAPH_BOTTOM - 3 - (bbox[3] - bbox[1])) // 2 - bbox[1]
+        draw_text(draw, ((width - (bbox[2] - bbox[0])) // 2, y), footer, self.font_xs)
+
+
+class RainScreen(WeatherScreen):
+    """Precipitation expected in the next hour, from the same forecast."""
+
+    name = "rain"
+
+    def __init__(self, lat: float, lon: float):
+        super().__init__(lat, lon, source="forecast")
+
+    def _next_hour(self) -> tuple[float, int | None, float | None] | None:
+        # (mm in the next hour, minutes until it starts or None if dry, mm today)
+        if self.forecast is None:
+            return None
+        now = time.time()
+        daily = today(self.forecast, now)
+        day_mm = daily["precipitation_sum"] if daily else None
+        total, begins = precipitation(self.forecast, now, now + 3600)
+        if total < RAIN_THRESHOLD:
+            return 0.0, None, day_mm
+        # Minutes in steps of 5, so the frame isn't redrawn every minute.
+        return round(total, 1), int((begins - now) // 300 * 5), day_mm
+
+    def fingerprint(self):
+        return (self._next_hour(),)
+
+    def draw(self, draw, width, height):
+        rain = self._next_hour()
+        if rain is None:
+            rows = [("Rain", self.font_sm), ("N/A", self.font_lg)]
+        elif rain[1] is None:
+            rows = [("Next hour", self.font_sm), ("Dry", self.font_lg)]
+            if rain[2]:
+                rows.append((f"Today {rain[2]:.1f} mm", self.font_sm))
+        else:
+            mm, minutes, _ = rain
+            rows = [
+                ("Rain next hour", self.font_sm),
+                (f"{mm:.1f} mm", self.font_lg),
+                ("now" if minutes == 0 else f"in {minutes} min", self.font_sm),
+            ]
+
+        draw_lines(draw, rows, width, height, spacing=6)
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from screens.base import Screen
+
+SNAPSHOT_PATH = Path(__file__).resolve().parent / ".snapshots.json"
+# At most one write every FLUSH_INTERVAL seconds: a few small writes an hour
+# instead of one per fetch, which is what wears out SD cards.
+FLUSH_INTERVAL = 300.0
+# Snapshots older than this aren't restored; a blank screen beats day-old data.
+MAX_AGE = 24 * 3600.0
+
+
+class SnapshotStore:
+    """
+    The last fetched data of every screen, kept in one JSON file so screens
+    have something to show right after a restart.
+
+    `restore()` runs once at startup. `save()` is called after each successful
+    fetch; it only updates the in-memory copy, and a timer writes the file at
+    most every `flush_interval` seconds, and only if some screen's data
+    actually changed. `close()` writes anything still pending. The file is
+    replaced atomically (written to a temporary file, synced, renamed), so a
+    power cut leaves the old or the new snapshot, never a torn one.
+    """
+
+    def __init__(self, path: Path = SNAPSHOT_PATH, flush_interval: float = FLUSH_INTERVAL, max_age: float = MAX_AGE):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_age = max_age
+        self.writes = 0
+        self._entries: dict[str, dict] = self._load()
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def restore(self, screens: list[Screen]) -> list[Screen]:
+        """Restores every screen that has a usable snapshot; returns those screens."""
+        restored = []
+        now = time.time()
+        for screen in screens:
+            entry = self._entries.get(screen.name)
+            if entry is None or now - entry.get("fetched_at", 0) > self.max_age:
+                continue
+            try:
+                if screen.restore(entry):
+                    restored.append(screen)
+            except (KeyError, TypeError, ValueError):
+                pass  # written by an older version; the first fetch replaces it
+        return restored
+
+    def save(self, screen: Screen) -> None:
+        snapshot = screen.snapshot()
+        if snapshot is None:
+            return
+        with self._lock:
+            previous = self._entries.get(screen.name)
+            self._entries[screen.name] = snapshot
+            # Only a refetch of the same data: keep the timestamp in memory
+            # but don't write the file for it.
+            if previous is not None and {**previous, "fetched_at": None} == {**snapshot, "fetched_at": None}:
+                return
+            self._dirty = True
+            self._schedule()
+
+    def _schedule(self):
+        # Caller holds self._lock.
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._timer = None
+            if not self._dirty:
+                return
+            tmp = self.path.with_suffix(".tmp")
+            try:
+                with open(tmp, "w") as f:
+                    json.dump(self._entries, f, separators=(",", ":"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                tmp.replace(self.path)
+            except OSError:
+                self._schedule()  # still dirty: try again later
+                return
+            self._dirty = False
+            self.writes += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        self.flush()
+
+
+def create_snapshot_store(config: dict | None = None) -> SnapshotStore | None:
+    # config: the "snapshots" section of config.json; None if disabled.
+    config = config or {}
+    if not config.get("enabled", True):
+        return None
+    return SnapshotStore(
+        flush_interval=config.get("flush_interval", FLUSH_INTERVAL),
+        max_age=config.get("max_age", MAX_AGE),
+    )
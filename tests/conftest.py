@@ -0,0 +1,6 @@
+import os
+from pathlib import Path
+
+# The screens package reads its config at import time; the tests don't need
+# any screens configured, and must not depend on the local config.json.
+os.environ.setdefault("DISPLAY_HATA_CONFIG", str(Path(__file__).resolve().parent / "config.json"))
@@ -0,0 +1,36 @@
+from screens.forecast import current
+
+HOUR = 3600
+
+
+def _forecast(temperature, apparent=None, codes=None):
+    n = len(temperature)
+    return {
+        "hourly": {
+            "time": [i * HOUR for i in range(n)],
+            "temperature_2m": temperature,
+            "apparent_temperature": apparent if apparent is not None else temperature,
+            "weathercode": codes if codes is not None else [3] * n,
+        }
+    }
+
+
+def test_current_interpolates_between_hours():
+    now = current(_forecast([1.0, 3.0, 5.0]), 1.5 * HOUR)
+    assert now == {"temp": 4, "feels_like": 4, "condition": "Overcast"}
+
+
+def test_current_skips_missing_values():
+    assert current(_forecast([1.0, None, None]), 1.5 * HOUR)["temp"] == 1
+    assert current(_forecast([None, 2.0, None, 8.0]), 0)["temp"] == 2
+    # Interpolated across the gap.
+    assert current(_forecast([0.0, None, 8.0]), 1.5 * HOUR)["temp"] == 6
+
+
+def test_current_without_temperatures_is_none():
+    assert current(_forecast([None, None, None]), HOUR) is None
+    assert current(_forecast([1.0, 2.0], apparent=[None, None]), HOUR) is None
+
+
+def test_current_missing_weathercode_is_generic():
+    assert current(_forecast([1.0, 2.0], codes=[None, None]), HOUR)["condition"] == "Weather"
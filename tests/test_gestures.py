@@ -0,0 +1,94 @@
+import pytest
+
+from buttons import ButtonController, GestureDetector, SimulatedButtonController
+
+
+def _run(detector: GestureDetector, events) -> list[tuple[float, str]]:
+    # events: (time, "edge") or (time, pressed level to poll with).
+    gestures = []
+    for now, event in events:
+        found = detector.edge(now) if event == "edge" else detector.poll(now, event)
+        gestures += [(now, gesture) for gesture in found]
+    return gestures
+
+
+def test_press_reported_after_double_press_window():
+    detector = GestureDetector(long_press=0.8, double_press=0.3, debounce=0.03)
+    assert _run(detector, [(0.0, "edge"), (0.1, "edge")]) == []
+    assert detector.deadline() == pytest.approx(0.13)  # end of the release's debounce
+    assert _run(detector, [(0.13, False)]) == []
+    assert detector.deadline() == pytest.approx(0.4)
+    assert _run(detector, [(0.4, False)]) == [(0.4, "press")]
+    assert detector.deadline() is None
+
+
+def test_press_on_down_edge_without_long_or_double():
+    detector = GestureDetector(long_press=None, double_press=None)
+    assert _run(detector, [(0.0, "edge")]) == [(0.0, "press")]
+    assert _run(detector, [(0.1, "edge"), (0.2, False)]) == []
+
+
+def test_press_on_release_without_double():
+    detector = GestureDetector(long_press=0.8, double_press=None)
+    assert _run(detector, [(0.0, "edge"), (0.1, "edge")]) == [(0.1, "press")]
+
+
+def test_long_press():
+    detector = GestureDetector(long_press=0.8, double_press=0.3)
+    assert _run(detector, [(0.0, "edge"), (0.79, True)]) == []
+    assert detector.deadline() == pytest.approx(0.8)
+    assert _run(detector, [(0.8, True)]) == [(0.8, "long")]
+    # Releasing afterwards reports nothing more.
+    assert _run(detector, [(1.5, "edge"), (2.0, False)]) == []
+    assert detector.deadline() is None
+
+
+def test_double_press():
+    detector = GestureDetector(long_press=0.8, double_press=0.3)
+    events = [(0.0, "edge"), (0.1, "edge"), (0.25, "edge"), (0.35, "edge"), (1.0, False)]
+    assert _run(detector, events) == [(0.25, "double")]
+
+
+def test_two_presses_outside_window_are_two_presses():
+    detector = GestureDetector(long_press=0.8, double_press=0.3)
+    events = [(0.0, "edge"), (0.1, "edge"), (0.4, False), (1.0, "edge"), (1.1, "edge"), (1.5, False)]
+    assert _run(detector, events) == [(0.4, "press"), (1.5, "press")]
+
+
+def test_bounce_is_one_press():
+    detector = GestureDetector(long_press=0.8, double_press=0.3, debounce=0.03)
+    down = [(0.0, "edge"), (0.004, "edge"), (0.009, "edge"), (0.015, "edge"), (0.03, True)]
+    up = [(0.2, "edge"), (0.203, "edge"), (0.21, "edge"), (0.23, False)]
+    assert _run(detector, down + up) == []
+    assert _run(detector, [(0.5, False)]) == [(0.5, "press")]
+
+
+def test_bounce_settling_on_other_level_is_reconciled():
+    # An odd number of bounce edges leaves the detector on the wrong level
+    # until the debounce window ends and poll() reads the real one.
+    detector = GestureDetector(long_press=None, double_press=None, debounce=0.03)
+    assert _run(detector, [(0.0, "edge"), (0.01, "edge")]) == [(0.0, "press")]
+    assert detector.pressed
+    assert _run(detector, [(0.03, True)]) == []
+    assert detector.pressed
+
+
+def test_controller_is_abstract():
+    with pytest.raises(TypeError):
+        ButtonController()
+
+
+def test_simulated_press_becomes_action():
+    buttons = SimulatedButtonController({21: {"press": "next"}, 20: {"press": 0, "long": 1}})
+    try:
+        buttons.click(21, hold=0.0)
+        assert buttons.wait(1.0)
+        assert buttons.take_action() == "next"
+        assert buttons.take_action() is None
+
+        buttons.press(20)
+        assert buttons.wait(2.0)  # long press after LONG_PRESS
+        assert buttons.take_action() == 1
+        buttons.release(20)
+    finally:
+        buttons.cleanup()
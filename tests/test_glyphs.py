@@ -0,0 +1,35 @@
+import pytest
+from PIL import Image, ImageDraw
+
+from screens.base import draw_text, glyph_atlas, load_font
+
+SIZES = [12, 14, 16, 18, 19, 20, 28]
+TEXTS = ["Lõu", "Lõunakeskus", "ÕÄÖÜ", "Šõ Žä", "→", "HŠõ", "Raatuse 12°C", "Õhtu, ülikool"]
+
+
+def _render(text, font, draw_with):
+    image = Image.new("1", (int(font.getlength(text)) + font.size * 2, font.size * 3))
+    draw_with(ImageDraw.Draw(image), (font.size, font.size), text, font)
+    return image.tobytes()
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("text", TEXTS)
+def test_draw_text_matches_freetype(text, size):
+    font = load_font("FreePixel.ttf", size)
+    expected = _render(text, font, lambda draw, xy, text, font: draw.text(xy, text, fill=1, font=font))
+    actual = _render(text, font, lambda draw, xy, text, font: draw_text(draw, xy, text, fill=1, font=font))
+    assert actual == expected
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_accents_that_keep_their_height_go_through_atlas(size):
+    atlas = glyph_atlas(load_font("FreePixel.ttf", size))
+    assert atlas.exact
+    assert atlas.covers("Äö Üä Šš Žž")
+
+
+def test_glyphs_that_move_the_string_fall_back_to_freetype():
+    # At 18 px "õ" lifts "Lõu" by a pixel, which the atlas can't reproduce.
+    atlas = glyph_atlas(load_font("FreePixel.ttf", 18))
+    assert not atlas.covers("Lõu")
@@ -0,0 +1,145 @@
+import asyncio
+
+from screens.lan_devices import DeviceTable, LanDiscovery, parse_arp
+
+ARP_TEXT = """\
+IP address       HW type     Flags       HW address            Mask     Device
+192.168.1.1      0x1         0x2         aa:bb:cc:00:00:01     *        eth0
+192.168.1.20     0x1         0x0         00:00:00:00:00:00     *        eth0
+192.168.1.30     0x1         0x2         aa:bb:cc:00:00:1e     *        eth0
+10.0.0.5         0x1         0x2         aa:bb:cc:00:00:05     *        eth1
+"""
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubProber:
+    """Answers for `alive` hosts; records every probe and the most in flight at once."""
+
+    def __init__(self, alive=(), fail=()):
+        self.alive = set(alive)
+        self.fail = set(fail)
+        self.probed: list[str] = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+
+    async def __call__(self, ip: str) -> bool:
+        self.probed.append(ip)
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if ip in self.fail:
+                raise OSError("network unreachable")
+            return ip in self.alive
+        finally:
+            self.in_flight -= 1
+
+
+def _discovery(arp: dict, prober=None, clock=None, **kwargs) -> LanDiscovery:
+    return LanDiscovery(
+        subnet="192.168.1.0/24",
+        local_ip="192.168.1.10",
+        prober=prober or StubProber(),
+        arp_reader=lambda: dict(arp),
+        clock=clock or Clock(),
+        **kwargs,
+    )
+
+
+def test_parse_arp_skips_incomplete_entries():
+    assert parse_arp(ARP_TEXT) == {
+        "192.168.1.1": "aa:bb:cc:00:00:01",
+        "192.168.1.30": "aa:bb:cc:00:00:1e",
+        "10.0.0.5": "aa:bb:cc:00:00:05",
+    }
+
+
+def test_parse_arp_irregular_rows():
+    # A row with a missing column defeats the strided fast path.
+    text = ARP_TEXT + "192.168.1.40     0x1         0x2         aa:bb:cc:00:00:28     *\n"
+    assert parse_arp(text)["192.168.1.40"] == "aa:bb:cc:00:00:28"
+    assert "192.168.1.20" not in parse_arp(text)
+
+
+def test_update_counts_arp_entries_in_subnet_and_self():
+    arp = parse_arp(ARP_TEXT)
+    discovery = _discovery(arp, sweep_interval=float("inf"))
+    assert discovery.update() == 3  # .1, .30 and the local address; 10.0.0.5 is elsewhere
+    assert set(discovery.table.devices()) == {"192.168.1.1", "192.168.1.30", "192.168.1.10"}
+
+
+def test_sweep_probes_every_other_host_and_adds_the_alive_ones():
+    prober = StubProber(alive={"192.168.1.50", "192.168.1.51"}, fail={"192.168.1.52"})
+    discovery = _discovery({}, prober=prober)
+    assert discovery.update() == 3
+    assert len(prober.probed) == 253  # .1 to .254 without the local address
+    assert "192.168.1.10" not in prober.probed
+    assert discovery.last_sweep == 1000.0
+
+
+def test_sweep_picks_up_hosts_resolved_while_probing():
+    arp = {}
+    prober = StubProber()
+
+    async def probe(ip):
+        # Host drops the probe, but the kernel resolves it meanwhile.
+        if ip == "192.168.1.77":
+            arp[ip] = "aa:bb:cc:00:00:4d"
+        return await prober(ip)
+
+    discovery = _discovery(arp, prober=probe)
+    discovery.update()
+    assert discovery.table.devices()["192.168.1.77"][0] == "aa:bb:cc:00:00:4d"
+
+
+def test_sweeps_only_every_sweep_interval():
+    prober = StubProber()
+    clock = Clock()
+    discovery = _discovery({}, prober=prober, clock=clock, sweep_interval=300)
+    discovery.update()
+    clock.now += 299
+    discovery.update()
+    assert len(prober.probed) == 253
+    clock.now += 1
+    discovery.update()
+    assert len(prober.probed) == 2 * 253
+
+
+def test_probe_concurrency_is_bounded():
+    prober = StubProber()
+    discovery = _discovery({}, prober=prober, max_concurrent=16)
+    discovery.sweep()
+    assert prober.most_in_flight == 16
+
+
+def test_devices_expire():
+    arp = {"192.168.1.30": "aa:bb:cc:00:00:1e"}
+    clock = Clock()
+    discovery = _discovery(arp, clock=clock, sweep_interval=float("inf"), expiry=900)
+    assert discovery.update() == 2
+    del arp["192.168.1.30"]
+    clock.now += 899
+    assert discovery.update() == 2
+    clock.now += 1
+    assert discovery.update() == 1  # only the local address, seen on every update
+
+
+def test_device_table_keeps_known_mac():
+    table = DeviceTable()
+    table.see("192.168.1.30", "aa:bb:cc:00:00:1e", 1.0)
+    table.see("192.168.1.30", None, 2.0)  # answered a probe; MAC not in this update
+    assert table.devices()["192.168.1.30"] == ("aa:bb:cc:00:00:1e", 2.0)
+
+
+def test_no_network_found(monkeypatch):
+    monkeypatch.setattr("screens.lan_devices.get_local_address", lambda: None)
+    discovery = LanDiscovery(prober=StubProber(), arp_reader=dict, clock=Clock())
+    assert discovery.update() == 0
+    assert discovery.subnet is None
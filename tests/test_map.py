@@ -0,0 +1,96 @@
+import itertools
+import random
+
+import pytest
+from PIL import Image, ImageDraw
+
+from screens.map import ASCII_LINES, BLINK_COORDINATES, MapScreen
+
+SIZE = (128, 64)
+STATES = list(itertools.product([False, True], repeat=len(BLINK_COORDINATES)))
+
+
+def _reference(screen: MapScreen, blink: dict) -> bytes:
+    # The original renderer: ImageDraw.text() for every visible character.
+    image = Image.new("1", SIZE)
+    draw = ImageDraw.Draw(image)
+    char_w, char_h = screen._char_dims()
+    y_start = (SIZE[1] - char_h * len(ASCII_LINES)) // 2
+    for row, line in enumerate(ASCII_LINES):
+        for col, char in enumerate(line):
+            if (row, col) in blink and not blink[(row, col)]:
+                continue
+            draw.text((col * char_w, y_start + row * char_h), char, fill="white", font=screen.font)
+    return image.tobytes()
+
+
+def _frame(screen: MapScreen, state, seed: int) -> tuple[bytes, dict]:
+    # One frame from `state`; returns its pixels and the blink state it was drawn with.
+    screen._blink = dict(zip(BLINK_COORDINATES, state))
+    random.seed(seed)
+    image = Image.new("1", SIZE)
+    screen.draw(ImageDraw.Draw(image), *SIZE)
+    return image.tobytes(), dict(screen._blink)
+
+
+class _Counting(dict):
+    # Records every assignment, i.e. every blink toggle.
+    def __init__(self, blink: dict, toggles: list):
+        super().__init__(blink)
+        self._toggles = toggles
+
+    def __setitem__(self, key, value):
+        self._toggles.append(key)
+        super().__setitem__(key, value)
+
+
+@pytest.mark.parametrize("prerender", [True, False])
+def test_pixel_identical_to_original_renderer(prerender):
+    screen = MapScreen(prerender=prerender)
+    screen.blink_period = 0  # one toggle per frame
+    for seed, state in enumerate(STATES):
+        pixels, blink = _frame(screen, state, seed)
+        assert pixels == _reference(screen, blink), f"blink state {state}"
+
+
+def test_prerendered_matches_per_character():
+    chars = MapScreen(prerender=False)
+    blink = MapScreen(prerender=True)
+    chars.blink_period = blink.blink_period = 0
+    for seed, state in enumerate(STATES):
+        assert _frame(chars, state, seed) == _frame(blink, state, seed), f"blink state {state}"
+
+
+def test_blink_toggles_once_per_period(monkeypatch):
+    screen = MapScreen()
+    screen.blink_period = 0.5
+    now = [100.0]
+    monkeypatch.setattr("screens.map.time.monotonic", lambda: now[0])
+    toggles = []
+    monkeypatch.setattr(screen, "_blink", _Counting(screen._blink, toggles))
+    draw = ImageDraw.Draw(Image.new("1", SIZE))
+
+    screen.draw(draw, *SIZE)  # first frame
+    assert len(toggles) == 1
+    now[0] += 0.1
+    screen.draw(draw, *SIZE)  # same period: no toggle
+    assert len(toggles) == 1
+    now[0] += 1.0  # two periods passed
+    screen.draw(draw, *SIZE)
+    assert len(toggles) == 3
+
+
+def test_frames_follow_blinks(monkeypatch):
+    screen = MapScreen()
+    screen.blink_period = 0.5
+    now = [100.0]
+    monkeypatch.setattr("screens.map.time.monotonic", lambda: now[0])
+    draw = ImageDraw.Draw(Image.new("1", SIZE))
+
+    screen.draw(draw, *SIZE)
+    # Next frame when the next cell blinks, not 1/fps later.
+    assert screen.next_frame_at(100.0) == pytest.approx(100.505)
+    # fps stays the upper bound.
+    assert screen.next_frame_at(100.5) == pytest.approx(100.5 + 1 / screen.fps)
+    screen.blink_period = 0
+    assert screen.next_frame_at(100.0) == pytest.approx(100.0 + 1 / screen.fps)
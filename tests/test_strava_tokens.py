@@ -0,0 +1,164 @@
+"""
+StravaTokens and StravaClient against a local fake OAuth server that behaves
+like Strava's: every refresh rotates the refresh token, a reused one is
+rejected, and the API answers 401 to expired or revoked tokens. Token
+lifetimes are scaled down from hours to seconds.
+"""
+
+import json
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from screens import http_client, strava
+from screens.strava import StravaClient, StravaTokens
+
+REFRESH_DELAY = 0.25  # seconds the fake token endpoint takes
+LIFETIME = 1.5  # seconds a fake access token is valid
+MARGIN = 0.6  # background refresh this long before expiry
+
+
+class FakeStrava:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.refresh_token = "r0"
+        self.access_token: str | None = None
+        self.expires_at = 0.0
+        self.refreshes = 0
+        self.rejected = 0
+
+    def token(self, form: dict) -> tuple[int, dict]:
+        time.sleep(REFRESH_DELAY)
+        with self.lock:
+            if form.get("refresh_token") != self.refresh_token:
+                self.rejected += 1
+                return 400, {"message": "Bad Request", "errors": [{"field": "refresh_token", "code": "invalid"}]}
+            self.generation += 1
+            self.refreshes += 1
+            self.refresh_token = f"r{self.generation}"
+            self.access_token = f"a{self.generation}"
+            self.expires_at = time.time() + LIFETIME
+            return 200, {"access_token": self.access_token, "refresh_token": self.refresh_token, "expires_at": self.expires_at}
+
+    def stats(self, authorization: str) -> tuple[int, dict]:
+        with self.lock:
+            if authorization != f"Bearer {self.access_token}" or time.time() >= self.expires_at:
+                return 401, {"message": "Authorization Error"}
+        return 200, {"ytd_ride_totals": {"distance": 123456.0}}
+
+    def revoke(self):
+        with self.lock:
+            self.access_token = None
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(strava, "EXPIRY_SLACK", 0.2)
+    fake = FakeStrava()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            form = parse_qs(self.rfile.read(int(self.headers["content-length"])).decode())
+            self._reply(*fake.token({key: values[0] for key, values in form.items()}))
+
+        def do_GET(self):
+            self._reply(*fake.stats(self.headers.get("authorization", "")))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fake.base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield fake
+    server.shutdown()
+    http_client.close()
+
+
+@pytest.fixture
+def tokens(fake, tmp_path):
+    tokens = StravaTokens("id", "secret", "r0", cache_path=tmp_path / "strava_cache.json",
+                          token_url=f"{fake.base}/oauth/token", margin=MARGIN)
+    yield tokens
+    tokens.stop()
+
+
+def _client(fake, tokens) -> StravaClient:
+    return StravaClient(tokens, athlete_id="1", stats_url=f"{fake.base}/athletes/{{athlete_id}}/stats")
+
+
+def test_concurrent_cold_start_refreshes_once(fake, tokens):
+    client = _client(fake, tokens)
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda _: client.get_ride_stats(), range(16)))
+    assert all(r["ytd_ride_totals"]["distance"] == 123456.0 for r in results)
+    assert (fake.refreshes, fake.rejected) == (1, 0)
+
+
+def test_background_refresh_keeps_requests_off_the_refresh_path(fake, tokens):
+    client = _client(fake, tokens)
+    client.get_ride_stats()  # cold start: the one inline refresh
+    worst = 0.0
+    end = time.monotonic() + 2.5 * LIFETIME
+    while time.monotonic() < end:
+        start = time.monotonic()
+        client.get_ride_stats()
+        worst = max(worst, time.monotonic() - start)
+        time.sleep(0.05)
+    assert fake.refreshes >= 3 and fake.rejected == 0
+    assert worst < REFRESH_DELAY
+
+
+def test_revoked_token_is_refreshed_once_and_retried(fake, tokens):
+    client = _client(fake, tokens)
+    client.get_ride_stats()
+    fake.revoke()
+    assert client.get_ride_stats()["ytd_ride_totals"]["distance"] == 123456.0
+    assert (fake.refreshes, fake.rejected) == (2, 0)
+
+
+def test_cache_is_private_and_reloaded(fake, tokens):
+    _client(fake, tokens).get_ride_stats()
+    assert stat.S_IMODE(os.stat(tokens.cache_path).st_mode) == 0o600
+
+    reloaded = StravaTokens("id", "secret", "r0", cache_path=tokens.cache_path, token_url=f"{fake.base}/oauth/token")
+    try:
+        assert reloaded.refresh_token == fake.refresh_token
+        # The cached access token is still valid: no refresh needed.
+        assert reloaded.get() == fake.access_token
+        assert fake.refreshes == 1
+    finally:
+        reloaded.stop()
+
+
+def test_failed_background_refresh_is_retried(fake, tokens, monkeypatch):
+    monkeypatch.setattr(strava, "RETRY_AFTER", 0.05)
+    client = _client(fake, tokens)
+    client.get_ride_stats()
+    # The server rejects the next background refresh, then accepts again:
+    # the refresh is retried after RETRY_AFTER and succeeds.
+    with fake.lock:
+        expected = fake.refresh_token
+        fake.refresh_token = "elsewhere"
+    time.sleep(LIFETIME - MARGIN + REFRESH_DELAY + 0.1)
+    assert fake.rejected >= 1
+    with fake.lock:
+        fake.refresh_token = expected
+    time.sleep(0.5)
+    assert fake.refreshes == 2
+    assert client.get_ride_stats()["ytd_ride_totals"]["distance"] == 123456.0
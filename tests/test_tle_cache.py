@@ -0,0 +1,62 @@
+import os
+import time
+
+import pytest
+
+from screens import satellites
+
+
+class FailingClient:
+    """Stands in for the shared HTTP client; every request fails."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def get(self, url):
+        self.requests += 1
+        raise OSError("network down")
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    client = FailingClient()
+    monkeypatch.setattr(satellites, "_TLE_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(satellites, "_TLE_RETRY_AT", {})
+    monkeypatch.setattr(satellites.http_client, "client", lambda: client)
+    return client
+
+
+def _stale_file(tmp_path, name):
+    path = tmp_path / f"{name}.tle"
+    path.write_text("old")
+    old = time.time() - satellites.TLE_MAX_AGE - 60
+    os.utime(path, (old, old))
+    return path
+
+
+def test_failed_download_keeps_old_file_until_retry(client, tmp_path, monkeypatch):
+    path = _stale_file(tmp_path, "ISS")
+
+    assert satellites._load_tles("ISS", "CATNR=25544") == (path.stat().st_mtime, "old")
+    assert satellites._load_tles("ISS", "CATNR=25544") == (path.stat().st_mtime, "old")
+    assert client.requests == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr(satellites.time, "monotonic", lambda: now + satellites.TLE_RETRY_AFTER + 1)
+    satellites._load_tles("ISS", "CATNR=25544")
+    assert client.requests == 2
+
+
+def test_backoff_is_per_source(client, tmp_path):
+    _stale_file(tmp_path, "ISS")
+    _stale_file(tmp_path, "Galileo")
+
+    satellites._load_tles("ISS", "CATNR=25544")
+    satellites._load_tles("Galileo", "GROUP=galileo")
+    satellites._load_tles("ISS", "CATNR=25544")
+    assert client.requests == 2
+
+
+def test_failed_download_without_file_raises(client):
+    with pytest.raises(OSError):
+        satellites._load_tles("ISS", "CATNR=25544")